@@ -0,0 +1,106 @@
+"""
+One long-lived browser and worker thread per betting account
+
+Each account gets a single-thread worker with its own BrowserSlot. The worker
+binds its slot to a thread-local when it starts, so code running on it sees
+its own driver and proxy and never restarts a browser shared with another
+account. The same bet can then be placed on every account concurrently.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BrowserSlot:
+    """
+    Browser state of one thread: the driver, its proxy and the account it was opened for
+    """
+
+    __slots__ = ("driver", "proxy", "current_proxy", "account", "initialized", "open")
+
+    def __init__(self):
+        self.driver = None
+        self.proxy = None  # Proxy the driver was set up with
+        self.current_proxy = None  # Proxy requested for the account, used to detect switches
+        self.account = None
+        self.initialized = False
+        self.open = False
+
+
+class AccountBrowserPool:
+    """
+    Single-thread workers keyed by account, each bound to its own BrowserSlot
+    """
+
+    def __init__(self, thread_name_prefix="msport-account"):
+        """
+        Initialize the pool
+
+        Parameters:
+        - thread_name_prefix: Prefix of the worker thread names, followed by the account key
+        """
+        self.__thread_name_prefix = thread_name_prefix
+        self.__local = threading.local()
+        self.__workers = {}  # key -> (executor, slot)
+        self.__lock = threading.Lock()
+
+    def current_slot(self):
+        """
+        Return the BrowserSlot bound to the calling thread
+
+        Returns:
+        - The slot of the account worker running the caller, or None outside the pool
+        """
+        return getattr(self.__local, "slot", None)
+
+    def submit(self, key, fn, *args, **kwargs):
+        """
+        Run a function on the worker of an account, starting the worker on first use
+
+        Parameters:
+        - key: Account key, e.g. the username
+        - fn: Callable to run on the worker thread
+        - *args, **kwargs: Arguments passed to fn
+
+        Returns:
+        - concurrent.futures.Future of the call
+        """
+        with self.__lock:
+            worker = self.__workers.get(key)
+            if worker is None:
+                slot = BrowserSlot()
+                executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix=f"{self.__thread_name_prefix}-{key}",
+                    initializer=self.__bind,
+                    initargs=(slot,)
+                )
+                worker = (executor, slot)
+                self.__workers[key] = worker
+        return worker[0].submit(fn, *args, **kwargs)
+
+    def keys(self):
+        """Return the keys of the accounts that have a worker"""
+        with self.__lock:
+            return list(self.__workers)
+
+    def shutdown(self, close_slot=None):
+        """
+        Stop every worker
+
+        Parameters:
+        - close_slot: Optional callable run on each worker before it stops, e.g. to quit its browser
+        """
+        with self.__lock:
+            workers = list(self.__workers.values())
+            self.__workers.clear()
+
+        for executor, _ in workers:
+            if close_slot is not None:
+                try:
+                    executor.submit(close_slot).result()
+                except Exception:
+                    pass
+            executor.shutdown(wait=True)
+
+    def __bind(self, slot):
+        self.__local.slot = slot
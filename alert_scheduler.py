@@ -0,0 +1,64 @@
+"""
+Time-ordered scheduler for alerts that are too young to be processed
+
+Alerts younger than a minute are parked in a heap keyed on the time they
+mature and released exactly when they do, instead of sleeping inline and
+holding up every other alert of the same poll.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+
+class AlertScheduler:
+    """
+    Min-heap of (due_time, sequence, alert) entries
+    """
+
+    def __init__(self):
+        self.__heap = []
+        self.__sequence = itertools.count()  # Keeps equal due times in insertion order
+        self.__scheduled_ids = set()  # Alert IDs currently parked, so re-polled alerts are not parked twice
+        self.__lock = threading.Lock()
+
+    def schedule(self, alert, due_time):
+        """
+        Park an alert until due_time
+
+        Parameters:
+        - alert: The alert data from Pinnacle
+        - due_time: Epoch seconds at which the alert may be processed
+
+        Returns:
+        - True if the alert was parked, False if it is already waiting
+        """
+        alert_id = alert.get("id")
+        with self.__lock:
+            if alert_id and alert_id in self.__scheduled_ids:
+                return False
+            if alert_id:
+                self.__scheduled_ids.add(alert_id)
+            heapq.heappush(self.__heap, (due_time, next(self.__sequence), alert))
+            return True
+
+    def pop_due(self, now=None):
+        """
+        Remove and return all alerts whose due time has passed, oldest first
+        """
+        now = time.time() if now is None else now
+        due_alerts = []
+        with self.__lock:
+            while self.__heap and self.__heap[0][0] <= now:
+                _, _, alert = heapq.heappop(self.__heap)
+                self.__scheduled_ids.discard(alert.get("id"))
+                due_alerts.append(alert)
+        return due_alerts
+
+    def next_due_time(self):
+        """Due time of the earliest parked alert, or None if nothing is parked"""
+        with self.__lock:
+            return self.__heap[0][0] if self.__heap else None
+
+    def __len__(self):
+        return len(self.__heap)
@@ -0,0 +1,90 @@
+"""
+Bounded, insertion-ordered dedup index with expiry
+
+Replaces ever-growing sets that were trimmed by copying them into lists. Keys
+are kept in an OrderedDict in insertion order, so adding a key and evicting
+the oldest one are both O(1) and memory stays flat.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class DedupIndex:
+    """
+    Set-like index of recently seen keys, bounded in size and age
+    """
+
+    def __init__(self, max_size=5000, ttl_seconds=None, store=None):
+        """
+        Initialize the index
+
+        Parameters:
+        - max_size: Maximum number of keys kept; the oldest are evicted first
+        - ttl_seconds: Seconds a key is remembered, or None to keep keys until evicted
+        - store: Optional ProcessedStateLog the keys are loaded from and appended to
+        """
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__store = store
+        self.__entries = OrderedDict()  # key -> time added
+        self.__lock = threading.Lock()
+
+        if self.__store is not None:
+            for key, added_at in self.__store.load():
+                self.__entries[key] = added_at
+            self.__evict(time.time())
+
+    def add(self, key, added_at=None):
+        """
+        Remember a key; adding a known key again refreshes its age
+
+        Parameters:
+        - key: Hashable key
+        - added_at: Epoch seconds the key was seen (defaults to now)
+        """
+        added_at = time.time() if added_at is None else added_at
+        with self.__lock:
+            self.__entries[key] = added_at
+            self.__entries.move_to_end(key)
+            self.__evict(time.time())
+        if self.__store is not None:
+            self.__store.append(key, added_at)
+
+    def __contains__(self, key):
+        with self.__lock:
+            added_at = self.__entries.get(key)
+            if added_at is None:
+                return False
+            if self.__ttl_seconds is not None and time.time() - added_at > self.__ttl_seconds:
+                del self.__entries[key]
+                return False
+            return True
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def clear(self):
+        """Forget every key, on disk as well"""
+        with self.__lock:
+            self.__entries.clear()
+        if self.__store is not None:
+            self.__store.clear()
+
+    def items(self):
+        """Snapshot of (key, time added) pairs, oldest first"""
+        with self.__lock:
+            return list(self.__entries.items())
+
+    def __evict(self, now):
+        """Drop keys over the size bound or past their TTL (caller holds the lock)"""
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+        if self.__ttl_seconds is None:
+            return
+        # Keys are ordered by age, so expired keys are always at the front
+        while self.__entries:
+            oldest_key, added_at = next(iter(self.__entries.items()))
+            if now - added_at <= self.__ttl_seconds:
+                break
+            del self.__entries[oldest_key]
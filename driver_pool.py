@@ -0,0 +1,258 @@
+"""
+Pool of pre-warmed Chrome drivers, one set per proxy
+
+Starting Chrome behind the proxy is the slowest step before a bet. DriverPool
+keeps ready drivers per proxy and hands one out when a browser is needed. A
+released driver is health-checked and reset, then kept for the next lease.
+Drivers are recycled after a number of uses or once Chrome has grown past a
+memory limit, and a replacement is warmed in the background.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+logger = logging.getLogger('msport_betting')
+
+
+class _PooledDriver:
+    """A driver with its proxy and usage counters"""
+
+    __slots__ = ("driver", "proxy", "uses", "created_at")
+
+    def __init__(self, driver, proxy):
+        self.driver = driver
+        self.proxy = proxy
+        self.uses = 0
+        self.created_at = time.time()
+
+
+def driver_memory_mb(driver):
+    """
+    Measure the resident memory of a driver's process tree
+
+    Parameters:
+    - driver: Selenium WebDriver started through a local chromedriver service
+
+    Returns:
+    - Memory in MB of chromedriver and every Chrome process under it, or None if unknown
+    """
+    try:
+        process = psutil.Process(driver.service.process.pid)
+        processes = [process] + process.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+
+    total = 0
+    for proc in processes:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+class DriverPool:
+    """
+    Thread-safe pool of warm drivers keyed by proxy
+    """
+
+    def __init__(self, create_driver, warm_per_proxy=1, max_uses=50, max_memory_mb=1500, clear_origins=()):
+        """
+        Initialize the pool
+
+        Parameters:
+        - create_driver: Callable taking a proxy (or None) and returning a new driver
+        - warm_per_proxy: Number of idle drivers kept ready for each proxy
+        - max_uses: Uses recorded with record_use after which a driver is replaced
+        - max_memory_mb: Memory of a driver's process tree above which it is replaced (None to disable)
+        - clear_origins: Origins whose stored data is wiped between leases, e.g. the MSport host
+        """
+        self.__create_driver = create_driver
+        self.__warm_per_proxy = warm_per_proxy
+        self.__max_uses = max_uses
+        self.__max_memory_mb = max_memory_mb
+        self.__clear_origins = [origin.rstrip("/") for origin in clear_origins]
+        self.__idle = {}  # proxy -> [_PooledDriver]
+        self.__leased = {}  # id(driver) -> _PooledDriver
+        self.__warming = {}  # proxy -> number of drivers being started
+        self.__closed = False
+        self.__lock = threading.Lock()
+        self.__warmer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="driver-warmer")
+
+    def warm(self, proxies):
+        """
+        Start drivers in the background until every proxy has its warm drivers
+
+        Parameters:
+        - proxies: Proxies to keep drivers ready for (None for a direct connection)
+        """
+        for proxy in set(proxies):
+            self.__replenish(proxy)
+
+    def lease(self, proxy=None):
+        """
+        Take a ready driver for a proxy, starting one if none is warm
+
+        Parameters:
+        - proxy: The proxy the driver must use
+
+        Returns:
+        - A WebDriver that belongs to the caller until it is released
+
+        Raises:
+        - RuntimeError: If the pool has been shut down
+        """
+        while True:
+            if self.__closed:
+                raise RuntimeError("Cannot lease a driver after the pool was shut down")
+            with self.__lock:
+                idle = self.__idle.get(proxy) or []
+                entry = idle.pop() if idle else None
+
+            if entry is None:
+                logger.info(f"No warm driver for proxy {proxy}, starting one")
+                entry = _PooledDriver(self.__create_driver(proxy), proxy)
+                break
+            if self.__is_healthy(entry.driver):
+                break
+            logger.warning(f"Warm driver for proxy {proxy} failed its health check, discarding it")
+            self.__quit(entry)
+
+        with self.__lock:
+            closed = self.__closed
+            if not closed:
+                self.__leased[id(entry.driver)] = entry
+        if closed:
+            # Shut down while the driver was starting, shutdown() never saw it
+            self.__quit(entry)
+            raise RuntimeError("Cannot lease a driver after the pool was shut down")
+        self.__replenish(proxy)
+        return entry.driver
+
+    def record_use(self, driver):
+        """
+        Count a use of a leased driver, e.g. one bet placed with it
+
+        Leasing a driver does not count as a use, only the calls to this method do.
+
+        Parameters:
+        - driver: A driver leased from the pool
+
+        Returns:
+        - True if the driver is due for recycling and should be released
+        """
+        with self.__lock:
+            entry = self.__leased.get(id(driver))
+        if entry is None:
+            return False
+        entry.uses += 1
+        return self.__needs_recycling(entry)
+
+    def release(self, driver):
+        """
+        Give a leased driver back, recycling it if it is worn out or broken
+
+        Parameters:
+        - driver: A driver leased from the pool
+        """
+        with self.__lock:
+            entry = self.__leased.pop(id(driver), None)
+        if entry is None:
+            return
+
+        if self.__needs_recycling(entry) or not self.__reset(entry.driver):
+            logger.info(f"Recycling driver for proxy {entry.proxy} after {entry.uses} uses")
+            self.__quit(entry)
+            self.__replenish(entry.proxy)
+            return
+
+        with self.__lock:
+            idle = self.__idle.setdefault(entry.proxy, [])
+            if not self.__closed and len(idle) < self.__warm_per_proxy:
+                idle.append(entry)
+                return
+        self.__quit(entry)
+
+    def idle_count(self, proxy=None):
+        """Return the number of warm drivers ready for a proxy"""
+        with self.__lock:
+            return len(self.__idle.get(proxy) or [])
+
+    def shutdown(self):
+        """Quit every driver of the pool, idle or leased"""
+        with self.__lock:
+            self.__closed = True
+            entries = [entry for idle in self.__idle.values() for entry in idle] + list(self.__leased.values())
+            self.__idle.clear()
+            self.__leased.clear()
+        self.__warmer.shutdown(wait=True)
+        for entry in entries:
+            self.__quit(entry)
+
+    def __replenish(self, proxy):
+        """Start drivers in the background until the proxy has its warm drivers"""
+        with self.__lock:
+            if self.__closed:
+                return
+            missing = self.__warm_per_proxy - len(self.__idle.get(proxy) or []) - self.__warming.get(proxy, 0)
+            if missing <= 0:
+                return
+            self.__warming[proxy] = self.__warming.get(proxy, 0) + missing
+        for _ in range(missing):
+            self.__warmer.submit(self.__start_warm_driver, proxy)
+
+    def __start_warm_driver(self, proxy):
+        try:
+            entry = _PooledDriver(self.__create_driver(proxy), proxy)
+        except Exception as e:
+            logger.error(f"Could not start warm driver for proxy {proxy}: {e}")
+            entry = None
+
+        with self.__lock:
+            self.__warming[proxy] -= 1
+            if entry is not None and not self.__closed:
+                self.__idle.setdefault(proxy, []).append(entry)
+                return
+        if entry is not None:
+            self.__quit(entry)
+
+    def __needs_recycling(self, entry):
+        if entry.uses >= self.__max_uses:
+            return True
+        if self.__max_memory_mb:
+            memory_mb = driver_memory_mb(entry.driver)
+            if memory_mb is not None and memory_mb > self.__max_memory_mb:
+                logger.info(f"Driver for proxy {entry.proxy} uses {memory_mb:.0f} MB, above {self.__max_memory_mb} MB")
+                return True
+        return False
+
+    @staticmethod
+    def __is_healthy(driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def __reset(self, driver):
+        """Clear the session of the last lease so the next account starts logged out"""
+        try:
+            # Session storage belongs to the tab, clear it (and local storage) on the page still open
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            for origin in self.__clear_origins:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            driver.get("about:blank")
+            return DriverPool.__is_healthy(driver)
+        except Exception:
+            return False
+
+    @staticmethod
+    def __quit(entry):
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting driver for proxy {entry.proxy}: {e}")
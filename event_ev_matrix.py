@@ -0,0 +1,95 @@
+"""
+Whole-event EV evaluation as array operations
+
+Joins every outcome of an MSport market book with the Pinnacle line it
+mirrors, on (period, family, line, side), devigs all Pinnacle lines of the
+event in one batch and computes EV and Kelly fraction for every candidate at
+once. Unlike the per-market scan it covers every line both books offer,
+e.g. totals above 5.5 and quarter handicaps.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from msport_market_book import line_key
+from utils.calculate_no_vig_prices import calculate_no_vig_prices_batch
+from utils.evaluate_bet import evaluate_bet
+
+# Column of each side in a Pinnacle price row
+SIDE_COLUMNS = {
+    "money_line": {"home": 0, "away": 1, "draw": 2},
+    "total": {"over": 0, "under": 1},
+    "spread": {"home": 0, "away": 1},
+    "dnb": {"home": 0, "away": 1},
+}
+
+EventCandidate = namedtuple("EventCandidate", [
+    "period", "family", "line", "side", "odds",
+    "true_price", "fair_probability", "ev", "kelly_fraction", "outcome"
+])
+
+
+def _pinnacle_key(outcome):
+    """Key of the Pinnacle line an MSport outcome mirrors, or None if it has none"""
+    if outcome.family == "money_line":
+        return (outcome.period, "money_line", None)
+    if outcome.family == "total":
+        return (outcome.period, "total", line_key(outcome.line))
+    if outcome.family == "dnb":
+        return (outcome.period, "spread", 0)
+    if outcome.family == "spread":
+        # A level handicap is bet through the DNB market
+        if line_key(outcome.line) == 0:
+            return None
+        # Pinnacle quotes spreads from the home side, so the away line is inverted
+        home_line = outcome.line if outcome.side == "home" else -outcome.line
+        return (outcome.period, "spread", line_key(home_line))
+    return None
+
+
+def evaluate_event(market_book, lines):
+    """
+    Evaluate every MSport outcome that has a matching Pinnacle line
+
+    Parameters:
+    - market_book: MSportMarketBook of the event
+    - lines: Pinnacle line index of the event, see `pinnacle_snapshot.index_pinnacle_lines`
+
+    Returns:
+    - List of EventCandidate, one per joined outcome with a usable fair price
+    """
+    if not lines:
+        return []
+
+    row_of_line = {}
+    price_rows = []
+    joined = []  # (outcome, row, column)
+    for outcome in market_book.outcomes():
+        key = _pinnacle_key(outcome)
+        if key is None or key not in lines:
+            continue
+        if key not in row_of_line:
+            row_of_line[key] = len(price_rows)
+            price_rows.append(lines[key])
+        joined.append((outcome, row_of_line[key], SIDE_COLUMNS[outcome.family][outcome.side]))
+
+    if not joined:
+        return []
+
+    fair_prices = calculate_no_vig_prices_batch(np.array(price_rows, dtype=float))["power"]
+    rows = np.array([row for _, row, _ in joined])
+    columns = np.array([column for _, _, column in joined])
+    odds = np.array([outcome.odds for outcome, _, _ in joined], dtype=float)
+    true_prices = fair_prices[rows, columns]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fair_probabilities, evs, kelly_fractions = evaluate_bet(odds, true_prices)
+
+    candidates = []
+    for i in np.flatnonzero(np.isfinite(true_prices) & (odds > 1)):
+        outcome = joined[i][0]
+        candidates.append(EventCandidate(
+            outcome.period, outcome.family, outcome.line, outcome.side, outcome.odds,
+            float(true_prices[i]), float(fair_probabilities[i]), float(evs[i]), float(kelly_fractions[i]), outcome
+        ))
+    return candidates
@@ -0,0 +1,130 @@
+"""
+Persistent cache of Pinnacle fixture -> MSport event ID resolutions
+
+The same fixture alerts many times a day. Once a search has resolved it to an
+MSport event the result is kept on disk until kickoff, so repeat alerts (and
+restarts) skip the search API entirely.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from utils.normalize_team_name import normalize_team_name
+from utils.write_json_atomic import write_json_atomic
+
+logger = logging.getLogger('msport_betting')
+
+
+class EventResolutionCache:
+    """
+    Maps normalized (home, away, start-time bucket) to the resolved MSport event
+    """
+
+    def __init__(self, path, bucket_minutes=60):
+        """
+        Initialize the cache and load unexpired entries from disk
+
+        Parameters:
+        - path: JSON file the cache is persisted to
+        - bucket_minutes: Width of the start time buckets used in the key
+        """
+        self.__path = path
+        self.__bucket_ms = int(bucket_minutes * 60 * 1000)
+        self.__entries = {}
+        self.__lock = threading.Lock()
+        self.__load()
+
+    def get(self, home_team, away_team, start_time):
+        """
+        Return the cached resolution for a fixture
+
+        Parameters:
+        - home_team: Pinnacle home team name
+        - away_team: Pinnacle away team name
+        - start_time: Pinnacle start time in milliseconds
+
+        Returns:
+        - Dictionary with event_id and score, or None if not cached or kicked off
+        """
+        key = self.__key(home_team, away_team, start_time)
+        if key is None:
+            return None
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry["expires_at"] <= time.time():
+                del self.__entries[key]
+                return None
+            return dict(entry)
+
+    def put(self, home_team, away_team, start_time, event_id, score):
+        """
+        Store a resolution; it expires at kickoff
+
+        Fixtures without a start time are not cached since their expiry is unknown.
+        """
+        key = self.__key(home_team, away_team, start_time)
+        if key is None:
+            return
+
+        expires_at = int(start_time) / 1000
+        if expires_at <= time.time():
+            return
+
+        with self.__lock:
+            self.__entries[key] = {
+                "event_id": event_id,
+                "score": score,
+                "expires_at": expires_at,
+            }
+            self.__purge_expired()
+            self.__save()
+
+    def discard(self, home_team, away_team, start_time):
+        """Forget a resolution, e.g. when the cached event no longer exists"""
+        key = self.__key(home_team, away_team, start_time)
+        with self.__lock:
+            if self.__entries.pop(key, None) is not None:
+                self.__save()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __key(self, home_team, away_team, start_time):
+        if not start_time:
+            return None
+        try:
+            bucket = int(start_time) // self.__bucket_ms
+        except (TypeError, ValueError):
+            return None
+        return f"{normalize_team_name(home_team)}|{normalize_team_name(away_team)}|{bucket}"
+
+    def __purge_expired(self):
+        """Remove entries whose match has kicked off (caller holds the lock)"""
+        now = time.time()
+        expired = [key for key, entry in self.__entries.items() if entry["expires_at"] <= now]
+        for key in expired:
+            del self.__entries[key]
+
+    def __load(self):
+        if not os.path.exists(self.__path):
+            return
+        try:
+            with open(self.__path, 'r') as f:
+                self.__entries = json.load(f)
+            self.__purge_expired()
+            logger.info(f"Loaded {len(self.__entries)} cached event resolutions from {self.__path}")
+        except Exception as e:
+            logger.error(f"Error loading event resolution cache: {e}")
+            self.__entries = {}
+
+    def __save(self):
+        """Persist the cache (caller holds the lock)"""
+        try:
+            write_json_atomic(self.__path, self.__entries)
+        except Exception as e:
+            logger.error(f"Error saving event resolution cache: {e}")
@@ -0,0 +1,186 @@
+"""
+In-memory catalogue of upcoming MSport soccer fixtures
+
+A background thread pages through MSport's upcoming fixtures for the next few
+hours and indexes them by normalized team name tokens, so event searches can be
+answered locally and only fall back to the live search API on a miss.
+"""
+import logging
+import threading
+import time
+
+from http_client import get_session
+from utils.normalize_team_name import normalize_team_name
+
+logger = logging.getLogger('msport_betting')
+
+
+def team_tokens(name):
+    """Words of a normalized team name that are used as index keys"""
+    return {word for word in normalize_team_name(name).split() if len(word) > 1}
+
+
+class FixtureCatalogue:
+    """
+    Periodically refreshed index of team name tokens -> upcoming MSport events
+    """
+
+    def __init__(self, api_host, path, hours_ahead=24, page_size=100,
+                 max_pages=50, refresh_seconds=600, sport_id="sr:sport:1"):
+        """
+        Initialize the catalogue
+
+        Parameters:
+        - api_host: MSport facts-center query host (same host as the search endpoint)
+        - path: Path of the paged upcoming fixtures endpoint on that host (not documented by MSport, so it must be configured)
+        - hours_ahead: Size of the start time window to catalogue
+        - page_size: Events requested per page
+        - max_pages: Upper bound on pages fetched per refresh
+        - refresh_seconds: Seconds between two refreshes
+        - sport_id: MSport sport ID (soccer by default)
+        """
+        self.__url = f"{api_host}{path}"
+        self.__hours_ahead = hours_ahead
+        self.__page_size = page_size
+        self.__max_pages = max_pages
+        self.__refresh_seconds = refresh_seconds
+        self.__sport_id = sport_id
+        self.__events = {}  # eventId -> event
+        self.__token_index = {}  # token -> set of eventIds
+        self.__refreshed_at = 0
+        self.__running = False
+        self.__stop_event = threading.Event()
+        self.__thread = None
+
+    def start(self):
+        """Start refreshing the catalogue in a background thread"""
+        if self.__running:
+            return
+        self.__running = True
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__refresh_loop, daemon=True)
+        self.__thread.start()
+        logger.info(f"Started fixture catalogue refresh every {self.__refresh_seconds} seconds")
+
+    def stop(self):
+        """Stop the background refresh"""
+        self.__running = False
+        self.__stop_event.set()
+
+    def candidates(self, home_team, away_team):
+        """
+        Return catalogued events sharing at least one name token with both teams
+
+        Parameters:
+        - home_team: Home team name
+        - away_team: Away team name
+
+        Returns:
+        - List of event dictionaries in the shape of search results
+        """
+        # Read both references once, a refresh swaps them atomically
+        token_index, events = self.__token_index, self.__events
+
+        home_ids = set()
+        for token in team_tokens(home_team):
+            home_ids |= token_index.get(token, set())
+        away_ids = set()
+        for token in team_tokens(away_team):
+            away_ids |= token_index.get(token, set())
+
+        return [events[event_id] for event_id in home_ids & away_ids]
+
+    def is_ready(self):
+        """Whether the catalogue has been filled at least once"""
+        return self.__refreshed_at > 0
+
+    def __len__(self):
+        return len(self.__events)
+
+    def refresh(self):
+        """
+        Fetch all pages of upcoming fixtures and rebuild the index
+
+        Returns:
+        - Number of catalogued events
+        """
+        now_ms = int(time.time() * 1000)
+        end_ms = now_ms + int(self.__hours_ahead * 60 * 60 * 1000)
+
+        events = {}
+        for page_num in range(1, self.__max_pages + 1):
+            page_events = self.__fetch_page(page_num, now_ms, end_ms)
+            if page_events is None:
+                # Keep the previous catalogue rather than publishing a partial one
+                return len(self.__events)
+
+            for event in page_events:
+                event_id = event.get("eventId")
+                start_time = event.get("startTime")
+                if not event_id:
+                    continue
+                if start_time and not (now_ms <= start_time <= end_ms):
+                    continue
+                events[event_id] = event
+
+            if len(page_events) < self.__page_size:
+                break
+
+        token_index = {}
+        for event_id, event in events.items():
+            for token in team_tokens(event.get("homeTeam", "")) | team_tokens(event.get("awayTeam", "")):
+                token_index.setdefault(token, set()).add(event_id)
+
+        self.__token_index, self.__events = token_index, events
+        self.__refreshed_at = time.time()
+        logger.info(f"Fixture catalogue refreshed with {len(events)} upcoming events")
+        return len(events)
+
+    def __refresh_loop(self):
+        while self.__running:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing fixture catalogue: {e}")
+            self.__stop_event.wait(self.__refresh_seconds)
+
+    def __fetch_page(self, page_num, start_ms, end_ms):
+        """
+        Fetch one page of upcoming fixtures
+
+        Returns:
+        - List of events (empty when past the last page), or None if the request failed
+        """
+        params = {
+            'sportId': self.__sport_id,
+            'pageNum': page_num,
+            'pageSize': self.__page_size,
+            'startTime': start_ms,
+            'endTime': end_ms
+        }
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+            "Accept": "application/json",
+            "Referer": "https://www.msport.com/",
+            "Operid": "2"
+        }
+
+        try:
+            response = get_session().get(self.__url, params=params, headers=headers)
+            if response.status_code != 200:
+                logger.warning(f"Fixture catalogue request failed with status: {response.status_code}")
+                return None
+            data = response.json().get("data") or {}
+        except Exception as e:
+            logger.error(f"Error fetching fixture catalogue page {page_num}: {e}")
+            return None
+
+        # Events come either as a flat list or grouped by tournament
+        if isinstance(data, list):
+            return data
+        if "events" in data:
+            return data["events"] or []
+        events = []
+        for tournament in data.get("tournaments", []) or []:
+            events.extend(tournament.get("events", []) or [])
+        return events
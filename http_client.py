@@ -0,0 +1,101 @@
+"""
+Pooled HTTP sessions for the MSport and Pinnacle REST calls
+
+All REST calls go through keep-alive sessions instead of the module-level
+requests.get, so repeated calls to the same host reuse their TCP/TLS
+connections. Every request gets a default timeout so a hung socket can never
+stall a worker thread indefinitely.
+"""
+import os
+import threading
+
+import dotenv
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+
+dotenv.load_dotenv()
+
+# (connect, read) timeout in seconds applied to every request without an explicit one
+DEFAULT_TIMEOUT = (
+    float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("HTTP_READ_TIMEOUT", "20")),
+)
+# Number of hosts a session keeps connection pools for
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+# Maximum keep-alive connections kept per host
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with per-host connection pooling, a default timeout and
+    optional fixed proxies
+    """
+
+    def __init__(self, proxies=None, timeout=DEFAULT_TIMEOUT,
+                 pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+        """
+        Initialize the session
+
+        Parameters:
+        - proxies: Proxies dictionary used for every request, e.g. from BetAccount.get_proxies()
+        - timeout: Default (connect, read) timeout in seconds
+        - pool_connections: Number of hosts to keep connection pools for
+        - pool_maxsize: Maximum keep-alive connections per host
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.fixed_proxies = proxies
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        # Pass proxies per request: session-level proxies lose against proxy env variables
+        if self.fixed_proxies and not kwargs.get("proxies"):
+            kwargs["proxies"] = self.fixed_proxies
+        return super().request(method, url, **kwargs)
+
+
+def get_session():
+    """
+    Return the process-wide session used for calls that need no proxy or cookies
+    (MSport search and match details, Pinnacle events and alerts)
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = PooledSession()
+    return _shared_session
+
+
+def create_session(proxies=None):
+    """
+    Create a dedicated session, e.g. for one betting account behind its own proxy
+    """
+    return PooledSession(proxies=proxies)
+
+
+def load_selenium_cookies(session, cookies):
+    """
+    Replace the cookies of a session with cookies exported from Selenium
+
+    Parameters:
+    - session: Session to update
+    - cookies: List of cookie dictionaries as returned by driver.get_cookies()
+    """
+    session.cookies.clear()
+    for cookie in cookies:
+        session.cookies.set_cookie(create_cookie(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+            secure=cookie.get("secure", False),
+        ))
@@ -74,6 +74,7 @@ def main():
             if bet_engine:
                 print("Cleaning up browser...")
                 bet_engine.cleanup()
+                bet_engine.close_account_browsers()
                 
             print("BetAlert shut down successfully")
             
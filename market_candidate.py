@@ -0,0 +1,65 @@
+"""
+Immutable record of a market that passed the EV scan
+
+Both market scans produce MarketCandidate objects and bet placement consumes
+them as they are, so no per-market copy of the alert's `shaped_data` is made
+and candidates of the same game cannot overwrite each other's fields.
+"""
+from msport_market_book import FIRST_HALF
+
+
+class MarketCandidate:
+    """
+    A priced MSport outcome, read-only once created
+    """
+
+    __slots__ = ("period", "family", "line", "side", "odds", "true_price", "ev", "stake")
+
+    def __init__(self, period, family, line, side, odds, true_price, ev, stake):
+        """
+        Create a candidate
+
+        Parameters:
+        - period: FULL_TIME or FIRST_HALF
+        - family: Market family (money_line, total, spread, dnb)
+        - line: The line for totals and handicaps, None otherwise
+        - side: The outcome (home, away, draw, over, under)
+        - odds: The decimal odds offered by MSport
+        - true_price: The fair decimal price from the devigged Pinnacle line
+        - ev: Expected value in percent
+        - stake: The stake to place
+        """
+        for name, value in zip(self.__slots__, (period, family, line, side, odds, true_price, ev, stake)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def is_first_half(self):
+        return self.period == FIRST_HALF
+
+    @property
+    def market_type(self):
+        """Market type as used by bet placement ("DNB" for draw no bet)"""
+        return "DNB" if self.family == "dnb" else self.family
+
+    @property
+    def points(self):
+        """Line as used by bet placement (0.0 for draw no bet)"""
+        return 0.0 if self.family == "dnb" else self.line
+
+    def __eq__(self, other):
+        if not isinstance(other, MarketCandidate):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
@@ -0,0 +1,147 @@
+"""
+Indexed view of the markets in an MSport `match/detail` response
+
+The raw response is a list of markets with free-text descriptions ("Over 2.5",
+"Home (-0.5)"). MSportMarketBook parses it once and indexes every outcome by
+(period, market family, line, outcome id) so market lookups are dict hits.
+"""
+import re
+from collections import namedtuple
+
+# Periods, matching Pinnacle's num_0 / num_1 period keys
+FULL_TIME = 0
+FIRST_HALF = 1
+
+# Market description -> (period, family)
+MARKET_FAMILIES = {
+    "1x2": (FULL_TIME, "money_line"),
+    "over/under": (FULL_TIME, "total"),
+    "asian handicap": (FULL_TIME, "spread"),
+    "dnb": (FULL_TIME, "dnb"),
+    "1st half - 1x2": (FIRST_HALF, "money_line"),
+    "1st half - o/u": (FIRST_HALF, "total"),
+    "1st half - asian handicap": (FIRST_HALF, "spread"),
+    "1st half - dnb": (FIRST_HALF, "dnb"),
+}
+
+# MSport outcome IDs per market family
+OUTCOME_IDS = {
+    "money_line": {"home": "1", "draw": "2", "away": "3"},
+    "total": {"over": "12", "under": "13"},
+    "spread": {"home": "1714", "away": "1715"},
+    "dnb": {"home": "4", "away": "5"},
+}
+
+# Families whose outcomes carry a line
+LINE_FAMILIES = ("total", "spread")
+
+_HANDICAP_PATTERN = re.compile(r'[(\[]([+-]?\d+\.?\d*)[)\]]')
+
+MarketOutcome = namedtuple("MarketOutcome", ["period", "family", "line", "side", "outcome_id", "odds", "description", "market"])
+
+
+def line_key(points):
+    """Convert a line to an exact dict key in quarter-goal units (2.5 -> 10, -0.25 -> -1)"""
+    if points is None:
+        return None
+    return int(round(float(points) * 4))
+
+
+def _parse_total_points(description):
+    """Extract the line from a total outcome description ("Over 2.5" -> 2.5)"""
+    description = description.lower()
+    if "over" in description:
+        return float(description.replace("over", "").strip())
+    if "under" in description:
+        return float(description.replace("under", "").strip())
+    return None
+
+
+def _parse_handicap_points(description):
+    """Extract the line from a handicap outcome description ("Home (-0.5)" -> -0.5)"""
+    match = _HANDICAP_PATTERN.search(description)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+class MSportMarketBook:
+    """
+    Outcomes of one MSport event indexed by (period, family, line key, outcome id)
+    """
+
+    def __init__(self, event_details):
+        """
+        Build the index from the `data` part of a `match/detail` response
+
+        Parameters:
+        - event_details: The event details dictionary from MSport
+        """
+        self.source = event_details
+        self.event_id = event_details.get("eventId")
+        self.__outcomes = {}
+        self.__sides = {family: {outcome_id: side for side, outcome_id in ids.items()}
+                        for family, ids in OUTCOME_IDS.items()}
+
+        for market in event_details.get("markets", []) or []:
+            period_family = MARKET_FAMILIES.get(market.get("description", "").lower())
+            if not period_family:
+                continue
+            period, family = period_family
+
+            for market_outcome in market.get("outcomes", []) or []:
+                self.__add_outcome(period, family, market, market_outcome)
+
+    def __add_outcome(self, period, family, market, market_outcome):
+        outcome_id = market_outcome.get("id")
+        side = self.__sides[family].get(outcome_id)
+        if side is None:
+            return
+
+        description = market_outcome.get("description", "")
+        try:
+            if family == "total":
+                line = _parse_total_points(description)
+            elif family == "spread":
+                line = _parse_handicap_points(description)
+            else:
+                line = None
+            if family in LINE_FAMILIES and line is None:
+                return
+            odds = float(market_outcome["odds"])
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return
+
+        key = (period, family, line_key(line), outcome_id)
+        # Keep the first occurrence, like the linear scan it replaces
+        if key not in self.__outcomes:
+            self.__outcomes[key] = MarketOutcome(period, family, line, side, outcome_id, odds, description, market)
+
+    def find(self, period, family, line, outcome_id):
+        """
+        Look up an outcome
+
+        Parameters:
+        - period: FULL_TIME or FIRST_HALF
+        - family: money_line, total, spread or dnb
+        - line: The line for totals/handicaps, None otherwise
+        - outcome_id: The MSport outcome ID
+
+        Returns:
+        - MarketOutcome or None if the market is not offered
+        """
+        return self.__outcomes.get((period, family, line_key(line), outcome_id))
+
+    def outcomes(self, period=None, family=None):
+        """
+        Iterate over the indexed outcomes, optionally filtered by period and family
+        """
+        for outcome in self.__outcomes.values():
+            if period is not None and outcome.period != period:
+                continue
+            if family is not None and outcome.family != family:
+                continue
+            yield outcome
+
+    def __len__(self):
+        return len(self.__outcomes)
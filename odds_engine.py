@@ -1,12 +1,18 @@
+import asyncio
 import dotenv
 import os
 import time
-import requests
 import json
 import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from http_client import get_session
+from alert_scheduler import AlertScheduler
+from dedup_index import DedupIndex
+from processed_state_log import ProcessedStateLog, resolve_state_dir
+
 # # Set up logging for odds engine
 # def setup_odds_logging():
 #     """Set up structured logging for the odds engine"""
@@ -66,23 +72,66 @@ class BetEngine:
     def notify(self, shaped_data):
         logger.info(f"Received bet notification: {shaped_data}")
 
+# Alert type -> notification stream whose cursor it advances. Alerts of any other
+# type leave the cursors alone, so a renamed type cannot push the wrong stream forward.
+ALERT_TYPE_STREAMS = {
+    "oddsDrop": "drop",
+    "limitChange": "limitChange",
+    "openingLine": "openingLine",
+}
+
 class OddsEngine:
     """
     Handles fetching odds from Pinnacle and sending alerts to the BetEngine when
     there are potential value betting opportunities.
     """
     
-    def __init__(self, bet_engine=None, pinnacle_host=None, pinnacle_api_host=None):
+    def __init__(self, bet_engine=None, pinnacle_host=None, pinnacle_api_host=None, state_dir=None):
         self.bet_engine = bet_engine if bet_engine else BetEngine()
+        # Share the bet engine's state directory so both logs end up side by side
+        if state_dir is None:
+            get_state_dir = getattr(self.bet_engine, "get_state_dir", None)
+            state_dir = get_state_dir() if get_state_dir else resolve_state_dir()
         self.__host = pinnacle_host or os.getenv("PINNACLE_HOST")
         self.__user_id = os.getenv("PINNACLE_USER_ID")
         self.__last_processed_timestamp = int(time.time()) * 1000  # Convert to milliseconds
-        self.__processed_alerts = set()  # Keep track of processed alert IDs
-        self.__processed_event_line_types = set()  # Track event ID + line type combinations
-        self.__processed_alerts_ids = set()  # Track alert IDs directly
+        # Processed alert IDs and event ID + line type combinations, oldest evicted first.
+        # They are also logged to disk so a restart does not re-process the lookback window.
+        dedup_ttl = float(os.getenv("ALERT_DEDUP_TTL", "86400"))
+        self.__processed_index = DedupIndex(
+            max_size=int(os.getenv("ALERT_DEDUP_MAX_SIZE", "5000")),
+            ttl_seconds=dedup_ttl,
+            store=ProcessedStateLog(os.path.join(state_dir, "processed_alerts.jsonl"), ttl_seconds=dedup_ttl)
+        )
         self.__running = False
         self.__monitor_thread = None
         
+        # "sync" processes alerts one after another, "async" evaluates a batch concurrently
+        self.__pipeline_mode = os.getenv("ALERT_PIPELINE_MODE", "sync").lower()
+        self.__pipeline_concurrency = int(os.getenv("ALERT_PIPELINE_CONCURRENCY", "8"))
+        # Worker threads of the async pipeline, created when monitoring starts or on the first batch
+        self.__pipeline_executor = None
+        self.__pipeline_executor_lock = threading.Lock()
+        # Dedup keys of alerts being evaluated right now, so concurrent tasks cannot take the same alert
+        self.__in_flight = set()
+        self.__processed_lock = threading.Lock()
+        
+        # Alerts younger than a minute wait here until they mature
+        self.__alert_scheduler = AlertScheduler()
+        
+        # "window" refetches a fixed lookback window on every poll, "stream" advances the
+        # notification cursors past the last alert seen so each poll only returns new alerts
+        self.__ingestion_mode = os.getenv("ALERT_INGESTION_MODE", "window").lower()
+        self.__stream_min_interval = float(os.getenv("ALERT_STREAM_MIN_INTERVAL", "2"))
+        self.__stream_interval = None
+        self.__unknown_alert_types = set()
+        lookback_time = int(time.time() * 1000) - (60 * 2 * 1000)
+        self.__cursors = {
+            "drop": (lookback_time, 0),
+            "limitChange": (int(os.getenv('LIMITCHANGENOTIFICATIONCURSOR', lookback_time)), 0),
+            "openingLine": (int(os.getenv('OPENLINENOTIFICATIONCURSOR', lookback_time)), 1),
+        }
+        
         # Validate required environment variables
         if not self.__host or not self.__user_id:
             raise ValueError("Pinnacle host, API host, or user ID not found in environment variables")
@@ -99,6 +148,7 @@ class OddsEngine:
             return
             
         self.__running = True
+        self.__get_pipeline_executor()
         self.__monitor_thread = threading.Thread(
             target=self.__monitoring_loop,
             args=(interval,),
@@ -117,6 +167,10 @@ class OddsEngine:
         self.__running = False
         if self.__monitor_thread and self.__monitor_thread.is_alive():
             self.__monitor_thread.join(timeout=5)
+        with self.__pipeline_executor_lock:
+            executor, self.__pipeline_executor = self.__pipeline_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
         logger.info("Odds monitoring stopped")
         
     def __monitoring_loop(self, interval):
@@ -126,70 +180,206 @@ class OddsEngine:
         while self.__running:
             try:
                 logger.info(f"Getting odds at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())}")
-                self.get_odds()
-                time.sleep(interval)
+                alerts_count = self.get_odds()
+                self.__wait_for_next_poll(self.__poll_interval(interval, alerts_count))
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
                 time.sleep(interval)
+    
+    def __poll_interval(self, interval, alerts_count):
+        """
+        Seconds until the next poll: fixed in window mode, adaptive in stream mode
+        
+        Parameters:
+        - interval: The configured interval between checks
+        - alerts_count: Number of alerts returned by the last poll
+        """
+        if self.__ingestion_mode != "stream":
+            return interval
+        
+        # Poll fast while alerts are flowing, back off towards the configured interval when idle
+        if alerts_count or self.__stream_interval is None:
+            self.__stream_interval = self.__stream_min_interval
+        else:
+            self.__stream_interval = min(interval, self.__stream_interval * 2)
+        return self.__stream_interval
+    
+    def __wait_for_next_poll(self, interval):
+        """
+        Wait until the next poll, processing parked alerts as soon as they mature
+        """
+        next_poll_time = time.time() + interval
+        while self.__running:
+            self.__process_alerts(self.__alert_scheduler.pop_due())
+            
+            now = time.time()
+            if now >= next_poll_time:
+                return
+            next_due_time = self.__alert_scheduler.next_due_time()
+            wake_time = next_poll_time if next_due_time is None else min(next_poll_time, next_due_time)
+            time.sleep(max(0, wake_time - now))
                 
     def get_odds(self):
         """
         Fetch new odds alerts from Pinnacle and process them
+        
+        Returns:
+        - Number of alerts retrieved
         """
-        current_time = int(time.time() * 1000)
-        # Look back 10 minutes for alerts
-        lookback_time = current_time - (60 * 2 * 1000)
-        # lookback_time = 1747423479000
+        if self.__ingestion_mode == "stream":
+            drop_cursor = self.__format_cursor(self.__cursors["drop"])
+            limit_change_cursor = self.__format_cursor(self.__cursors["limitChange"])
+            opening_line_cursor = self.__format_cursor(self.__cursors["openingLine"])
+            logger.info(f"Fetching alerts after cursors {drop_cursor}, {limit_change_cursor}, {opening_line_cursor}")
+        else:
+            current_time = int(time.time() * 1000)
+            # Look back 10 minutes for alerts
+            lookback_time = current_time - (60 * 2 * 1000)
+            # lookback_time = 1747423479000
 
-        logger.info(f"Looking back {lookback_time} milliseconds")
+            logger.info(f"Looking back {lookback_time} milliseconds")
+            drop_cursor = f"{lookback_time}-0"
+            limit_change_cursor = f"{os.getenv('LIMITCHANGENOTIFICATIONCURSOR', lookback_time)}-0"
+            opening_line_cursor = f"{os.getenv('OPENLINENOTIFICATIONCURSOR', lookback_time)}-1"
         
         try:
-            response = requests.get(
-                f"{self.__host}/alerts/{self.__user_id}?dropNotificationsCursor={lookback_time}-0&limitChangeNotificationsCursor={os.getenv('LIMITCHANGENOTIFICATIONCURSOR', lookback_time)}-0&openingLineNotificationsCursor={os.getenv('OPENLINENOTIFICATIONCURSOR', lookback_time)}-1"
+            response = get_session().get(
+                f"{self.__host}/alerts/{self.__user_id}?dropNotificationsCursor={drop_cursor}&limitChangeNotificationsCursor={limit_change_cursor}&openingLineNotificationsCursor={opening_line_cursor}"
             )
             
             if response.status_code != 200:
                 logger.error(f"Error fetching odds: HTTP {response.status_code}")
-                return
+                return 0
                 
             data = response.json()
             if "data" not in data or not data["data"]:
                 logger.info("No new alerts")
-                return
+                return 0
                 
             logger.info(f"Retrieved {len(data['data'])} alerts")
+            if self.__ingestion_mode == "stream":
+                self.__advance_cursors(data["data"])
             
-            # Process each alert
+            # Process mature alerts now, park the ones younger than a minute until they mature
+            mature_alerts = []
             for alert in data["data"]:
-                # Log alert timestamp
-                alert_timestamp = int(alert.get("timestamp", 0))
-                alert_time_str = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(alert_timestamp/1000))
-                logger.info(f"Processing alert with timestamp: {alert_time_str}")
-                
-                self.__process_alert(alert)
+                wait_time_seconds = self.__seconds_until_mature(alert)
+                if wait_time_seconds > 0:
+                    if self.__alert_scheduler.schedule(alert, time.time() + wait_time_seconds):
+                        logger.info(f"Alert is only {60 - wait_time_seconds:.1f} seconds old. Scheduled for processing in {wait_time_seconds:.1f} seconds.")
+                else:
+                    mature_alerts.append(alert)
+            
+            self.__process_alerts(mature_alerts)
+            return len(data["data"])
                 
         except Exception as e:
             logger.error(f"Error fetching odds: {e}")
+            return 0
     
-    def __process_alert(self, alert):
+    def __advance_cursors(self, alerts):
         """
-        Process a single alert from Pinnacle
+        Move each notification cursor to the last alert ID seen on its stream
         
         Parameters:
-        - alert: The alert data from Pinnacle
+        - alerts: The alerts returned by Pinnacle
+        """
+        for alert in alerts:
+            stream = ALERT_TYPE_STREAMS.get(alert.get("type"))
+            if stream is None:
+                if alert.get("type") not in self.__unknown_alert_types:
+                    self.__unknown_alert_types.add(alert.get("type"))
+                    logger.warning(f"Unknown alert type {alert.get('type')!r}, not advancing any cursor for it")
+                continue
+            alert_cursor = self.__parse_cursor(alert.get("id"))
+            if alert_cursor is None:
+                # Fall back to the alert's timestamp when its ID is not a cursor
+                try:
+                    alert_cursor = (int(alert.get("timestamp", 0)), 0)
+                except (TypeError, ValueError):
+                    logger.warning(f"Alert without a usable ID or timestamp, not advancing cursor: {alert.get('id')!r}")
+                    continue
+            self.__cursors[stream] = max(self.__cursors[stream], alert_cursor)
+    
+    @staticmethod
+    def __parse_cursor(alert_id):
+        """Parse a "<milliseconds>-<sequence>" alert ID into a comparable tuple, or None"""
+        try:
+            milliseconds, sequence = str(alert_id).split("-", 1)
+            return int(milliseconds), int(sequence)
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def __format_cursor(cursor):
+        return f"{cursor[0]}-{cursor[1]}"
+    
+    def __process_alerts(self, alerts):
+        """
+        Process a list of mature alerts with the configured pipeline
+        
+        Parameters:
+        - alerts: The alert data from Pinnacle
+        """
+        if not alerts:
+            return
+            
+        if self.__pipeline_mode == "async":
+            asyncio.run(self.__process_alerts_async(alerts))
+            return
+        
+        # Process each alert
+        for alert in alerts:
+            # Log alert timestamp
+            alert_timestamp = int(alert.get("timestamp", 0))
+            alert_time_str = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(alert_timestamp/1000))
+            logger.info(f"Processing alert with timestamp: {alert_time_str}")
+            
+            self.__process_alert(alert)
+    
+    async def __process_alerts_async(self, alerts):
         """
-        # Check if the alert timestamp is less than a minute ago
+        Process a batch of alerts concurrently, each alert as its own task
+        
+        Parameters:
+        - alerts: The alerts returned by Pinnacle
+        """
+        # The executor's worker count bounds how many alerts run at once
+        executor = self.__get_pipeline_executor()
+        await asyncio.gather(*(self.__process_alert_async(alert, executor) for alert in alerts))
+    
+    def __get_pipeline_executor(self):
+        """Return the async pipeline's worker threads, creating them after a start or stop"""
+        with self.__pipeline_executor_lock:
+            if self.__pipeline_executor is None:
+                self.__pipeline_executor = ThreadPoolExecutor(
+                    max_workers=self.__pipeline_concurrency, thread_name_prefix="alert-pipeline"
+                )
+            return self.__pipeline_executor
+        
+    async def __process_alert_async(self, alert, executor):
+        """
+        Run the blocking search -> details -> EV path of one alert in a worker thread
+        """
+        try:
+            await asyncio.get_running_loop().run_in_executor(executor, self.__process_alert, alert)
+        except Exception as e:
+            logger.error(f"Error processing alert {alert.get('id', '')}: {e}")
+    
+    def __seconds_until_mature(self, alert):
+        """Seconds left until an alert is a minute old (0 if it already is)"""
         alert_timestamp = int(alert.get("timestamp", 0))
         current_time = int(time.time() * 1000)  # Current time in milliseconds
         time_diff_ms = current_time - alert_timestamp
+        return max(0, 60000 - time_diff_ms) / 1000  # 60000 ms = 1 minute
+    
+    def __process_alert(self, alert):
+        """
+        Process a single alert from Pinnacle
         
-        # If alert is less than a minute old, wait until it's a minute old
-        if time_diff_ms < 60000:  # 60000 ms = 1 minute
-            wait_time_seconds = (60000 - time_diff_ms) / 1000
-            logger.info(f"Alert is only {time_diff_ms/1000:.1f} seconds old. Waiting {wait_time_seconds:.1f} seconds before processing.")
-            time.sleep(wait_time_seconds)
-            logger.info("Resuming alert processing after wait period.")
-        
+        Parameters:
+        - alert: The alert data from Pinnacle
+        """
         # Get alert identifiers
         alert_id = alert.get("eventId", "")
         line_type = alert.get("lineType", "")
@@ -197,40 +387,48 @@ class OddsEngine:
         
         # Create a unique key for this event + line type combination
         event_line_key = f"{alert_id}_{line_type}"
+        claims = {("event_line", event_line_key)}
+        if alert_direct_id:
+            claims.add(("alert", alert_direct_id))
         
-        # Skip if we've already processed this alert ID
-        if alert_direct_id and alert_direct_id in self.__processed_alerts_ids:
-            logger.info(f"Skipping already processed alert ID: {alert_direct_id}")
-            return
-        
-        # Skip if we've already processed this event + line type combination
-        if event_line_key in self.__processed_event_line_types:
-            logger.info(f"Skipping already processed event + line type: {event_line_key}")
-            return
+        # Check and claim under one lock: async tasks of a batch may carry the same alert
+        with self.__processed_lock:
+            # Skip if we've already processed this alert ID
+            if alert_direct_id and self.__is_taken(("alert", alert_direct_id)):
+                logger.info(f"Skipping already processed alert ID: {alert_direct_id}")
+                return
             
+            # Skip if we've already processed this event + line type combination
+            if self.__is_taken(("event_line", event_line_key)):
+                logger.info(f"Skipping already processed event + line type: {event_line_key}")
+                return
+            self.__in_flight |= claims
+        
+        try:
+            self.__evaluate_alert(alert, event_line_key, alert_direct_id)
+        finally:
+            with self.__processed_lock:
+                self.__in_flight -= claims
+    
+    def __is_taken(self, key):
+        """Whether a dedup key was processed or is being processed by another task"""
+        return key in self.__in_flight or key in self.__processed_index
+    
+    def __evaluate_alert(self, alert, event_line_key, alert_direct_id):
+        """
+        Filter a claimed alert and send it to the bet engine
+        
+        Parameters:
+        - alert: The alert data from Pinnacle
+        - event_line_key: Event ID + line type combination of the alert
+        - alert_direct_id: The alert ID, if any
+        """
         # Skip alerts with "(Corners)" in team names
         home_team = alert.get("home", "")
         away_team = alert.get("away", "")
         if "(Corners)" in home_team or "(Corners)" in away_team:
             logger.info(f"Skipping corners market: {home_team} vs {away_team}")
-            self.__processed_alerts.add(alert_id)
-            self.__processed_event_line_types.add(event_line_key)
-            if alert_direct_id:
-                self.__processed_alerts_ids.add(alert_direct_id)
-                logger.info(f"Added alert ID {alert_direct_id} to processed_alerts_ids")
-            self.__last_processed_timestamp = max(self.__last_processed_timestamp, int(alert.get("timestamp", 0)))
-            
-            # Limit the size of processed alerts set to prevent memory growth
-            if len(self.__processed_alerts) > 1000:
-                self.__processed_alerts = set(list(self.__processed_alerts)[-1000:])
-                
-            # Also limit the event + line type combinations set
-            if len(self.__processed_event_line_types) > 2000:
-                self.__processed_event_line_types = set(list(self.__processed_event_line_types)[-2000:])
-                
-            # Limit the size of processed alerts IDs set
-            if len(self.__processed_alerts_ids) > 3000:
-                self.__processed_alerts_ids = set(list(self.__processed_alerts_ids)[-3000:])
+            self.__mark_processed(alert, event_line_key, alert_direct_id)
             return
         
         # Skip alerts for matches that have already started (with timezone awareness)
@@ -245,24 +443,7 @@ class OddsEngine:
             current_datetime = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(current_time_ms/1000))
             logger.info(f"Skipping alert for match that already started: {home_team} vs {away_team}")
             logger.info(f"Match start time (GMT): {match_start_datetime}, Current time (GMT): {current_datetime}")
-            self.__processed_alerts.add(alert_id)
-            self.__processed_event_line_types.add(event_line_key)
-            if alert_direct_id:
-                self.__processed_alerts_ids.add(alert_direct_id)
-                logger.info(f"Added alert ID {alert_direct_id} to processed_alerts_ids")
-            self.__last_processed_timestamp = max(self.__last_processed_timestamp, int(alert.get("timestamp", 0)))
-            
-            # Limit the size of processed alerts set to prevent memory growth
-            if len(self.__processed_alerts) > 1000:
-                self.__processed_alerts = set(list(self.__processed_alerts)[-1000:])
-                
-            # Also limit the event + line type combinations set
-            if len(self.__processed_event_line_types) > 2000:
-                self.__processed_event_line_types = set(list(self.__processed_event_line_types)[-2000:])
-                
-            # Limit the size of processed alerts IDs set
-            if len(self.__processed_alerts_ids) > 3000:
-                self.__processed_alerts_ids = set(list(self.__processed_alerts_ids)[-3000:])
+            self.__mark_processed(alert, event_line_key, alert_direct_id)
             return
             
         # Shape the data for the bet engine
@@ -276,39 +457,28 @@ class OddsEngine:
             # Only add to processed collections if bet was successfully processed
             if bet_processed:
                 logger.info(f"Bet was successfully processed, adding to processed collections")
-                self.__processed_alerts.add(alert_id)
-                self.__processed_event_line_types.add(event_line_key)
-                self.__last_processed_timestamp = max(self.__last_processed_timestamp, int(alert.get("timestamp", 0)))
-                
-                # Limit the size of processed alerts set to prevent memory growth
-                if len(self.__processed_alerts) > 1000:
-                    self.__processed_alerts = set(list(self.__processed_alerts)[-1000:])
-                    
-                # Also limit the event + line type combinations set
-                if len(self.__processed_event_line_types) > 2000:
-                    self.__processed_event_line_types = set(list(self.__processed_event_line_types)[-2000:])
+                self.__mark_processed(alert, event_line_key)
             else:
-                if alert_direct_id:
-                    self.__processed_alerts_ids.add(alert_direct_id)
-                    logger.info(f"Added alert ID {alert_direct_id} to processed_alerts_ids")
-                 # Limit the size of processed alerts IDs set
-                if len(self.__processed_alerts_ids) > 3000:
-                    self.__processed_alerts_ids = set(list(self.__processed_alerts_ids)[-3000:])
-                self.__processed_alerts.add(alert_id)
-                self.__processed_event_line_types.add(event_line_key)
-                self.__last_processed_timestamp = max(self.__last_processed_timestamp, int(alert.get("timestamp", 0)))
-                
-                # Limit the size of processed alerts set to prevent memory growth
-                if len(self.__processed_alerts) > 1000:
-                    self.__processed_alerts = set(list(self.__processed_alerts)[-1000:])
-                    
-                # Also limit the event + line type combinations set
-                if len(self.__processed_event_line_types) > 2000:
-                    self.__processed_event_line_types = set(list(self.__processed_event_line_types)[-2000:])
+                self.__mark_processed(alert, event_line_key, alert_direct_id)
                 logger.info(f"Bet was not successfully processed, still adding to processed collections")
         else:
             logger.info(f"Invalid shaped data for alert, not adding to processed collections")
     
+    def __mark_processed(self, alert, event_line_key, alert_direct_id=None):
+        """
+        Record an alert in the dedup index
+        
+        Parameters:
+        - alert: The alert data from Pinnacle
+        - event_line_key: Event ID + line type combination of the alert
+        - alert_direct_id: Alert ID to remember as well, if any
+        """
+        self.__processed_index.add(("event_line", event_line_key))
+        if alert_direct_id:
+            self.__processed_index.add(("alert", alert_direct_id))
+            logger.info(f"Added alert ID {alert_direct_id} to processed alerts")
+        self.__last_processed_timestamp = max(self.__last_processed_timestamp, int(alert.get("timestamp", 0)))
+    
     def __shape_alert_data(self, alert):
         """
         Transform the alert data from Pinnacle format to BetEngine format
@@ -0,0 +1,176 @@
+"""
+Per-event cache of Pinnacle odds snapshots
+
+A full market scan asks for Pinnacle prices of ~60 markets of the same event.
+The cache keeps the parsed `periods` tree of one /events/{event_id} response so
+every lookup of the scan is answered from a single fetch. Each snapshot is also
+indexed once by (period, family, line in quarter-goal units), so looking up a
+spread or total is a dict hit instead of a scan over float-compared lines.
+"""
+import math
+import threading
+import time
+
+from msport_market_book import FULL_TIME, FIRST_HALF, line_key
+
+# Pinnacle period keys per MSport period
+PERIOD_KEYS = {FULL_TIME: "num_0", FIRST_HALF: "num_1"}
+
+
+def _price(value):
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return price if price > 1 else math.nan
+
+
+def index_pinnacle_lines(periods):
+    """
+    Index the lines of a Pinnacle `periods` payload
+
+    Parameters:
+    - periods: The `periods` dictionary of a Pinnacle /events/{id} response
+
+    Returns:
+    - Dictionary of (period, family, line key) -> (first, second, third) decimal prices,
+      where money lines are (home, away, draw), totals (over, under, NaN), spreads
+      (home, away, NaN) keyed by the home handicap, and missing prices are NaN
+    """
+    lines = {}
+    for period, period_key in PERIOD_KEYS.items():
+        period_data = (periods or {}).get(period_key) or {}
+
+        money_line = period_data.get("money_line") or {}
+        if money_line:
+            lines[(period, "money_line", None)] = (
+                _price(money_line.get("home")), _price(money_line.get("away")), _price(money_line.get("draw"))
+            )
+
+        for total in (period_data.get("totals") or {}).values():
+            try:
+                key = (period, "total", line_key(total.get("points")))
+            except (TypeError, ValueError):
+                continue
+            lines.setdefault(key, (_price(total.get("over")), _price(total.get("under")), math.nan))
+
+        for spread in (period_data.get("spreads") or {}).values():
+            try:
+                key = (period, "spread", line_key(spread.get("hdp")))
+            except (TypeError, ValueError):
+                continue
+            lines.setdefault(key, (_price(spread.get("home")), _price(spread.get("away")), math.nan))
+    return lines
+
+
+class PinnacleSnapshotCache:
+    """
+    Thread-safe TTL cache of Pinnacle `periods` trees keyed by event ID
+    """
+
+    def __init__(self, fetch_periods, ttl_seconds=15, max_events=500):
+        """
+        Initialize the cache
+
+        Parameters:
+        - fetch_periods: Callable taking an event ID and returning the `periods` dict (or None)
+        - ttl_seconds: How long a snapshot stays valid
+        - max_events: Number of snapshots kept before expired entries are purged
+        """
+        self.__fetch_periods = fetch_periods
+        self.__ttl = ttl_seconds
+        self.__max_events = max_events
+        self.__snapshots = {}  # event_id -> (fetched_at, periods, lines)
+        self.__event_locks = {}  # event_id -> lock of the fetch, dropped together with the snapshot
+        self.__lock = threading.Lock()
+
+    def get_periods(self, event_id):
+        """
+        Return the cached `periods` tree for an event, fetching it when missing or stale
+
+        Failed fetches are cached as None for the TTL as well, so a scan does not
+        retry the same failing request for every market.
+
+        Parameters:
+        - event_id: The Pinnacle event ID
+
+        Returns:
+        - The `periods` dictionary or None if not available
+        """
+        return self.__get_snapshot(event_id)[1]
+
+    def get_lines(self, event_id):
+        """
+        Return the line index of an event, see `index_pinnacle_lines`
+
+        Parameters:
+        - event_id: The Pinnacle event ID
+
+        Returns:
+        - Dictionary of (period, family, line key) -> prices, empty if not available
+        """
+        return self.__get_snapshot(event_id)[2]
+
+    def __get_snapshot(self, event_id):
+        snapshot = self.__get_fresh(event_id)
+        if snapshot is not None:
+            return snapshot
+
+        # Only one thread fetches a given event, the others wait for its result
+        with self.__lock_for(event_id):
+            snapshot = self.__get_fresh(event_id)
+            if snapshot is not None:
+                return snapshot
+
+            try:
+                periods = self.__fetch_periods(event_id)
+            except Exception:
+                periods = None
+
+            snapshot = (time.monotonic(), periods, index_pinnacle_lines(periods))
+            with self.__lock:
+                self.__snapshots[event_id] = snapshot
+                if len(self.__snapshots) > self.__max_events:
+                    self.__purge_expired()
+            return snapshot
+
+    def invalidate(self, event_id=None):
+        """
+        Drop the snapshot for one event, or every snapshot if no event ID is given
+        """
+        with self.__lock:
+            for key in list(self.__snapshots) if event_id is None else [event_id]:
+                self.__drop(key)
+
+    def __get_fresh(self, event_id):
+        with self.__lock:
+            snapshot = self.__snapshots.get(event_id)
+            if snapshot is None:
+                return None
+            if time.monotonic() - snapshot[0] > self.__ttl:
+                self.__drop(event_id)
+                return None
+            return snapshot
+
+    def __lock_for(self, event_id):
+        with self.__lock:
+            event_lock = self.__event_locks.get(event_id)
+            if event_lock is None:
+                event_lock = threading.Lock()
+                self.__event_locks[event_id] = event_lock
+            return event_lock
+
+    def __purge_expired(self):
+        """Remove expired snapshots (caller holds the lock)"""
+        now = time.monotonic()
+        expired = [key for key, (fetched_at, _, _) in self.__snapshots.items() if now - fetched_at > self.__ttl]
+        for key in expired:
+            self.__drop(key)
+
+    def __drop(self, event_id):
+        """Remove a snapshot and its fetch lock (caller holds the lock)"""
+        self.__snapshots.pop(event_id, None)
+        event_lock = self.__event_locks.get(event_id)
+        # A held lock belongs to a fetch in flight, which stores a new snapshot for it
+        if event_lock is not None and not event_lock.locked():
+            del self.__event_locks[event_id]
@@ -0,0 +1,149 @@
+"""
+Append-only log of processed keys (alert IDs, games) that survives restarts
+
+Every processed key is appended as one JSON line. At startup the file is
+read back so a restarted container does not re-evaluate, and possibly
+re-bet, alerts and games it already handled. The log is compacted down to
+its unexpired keys once it grows well beyond them.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger('msport_betting')
+
+
+def resolve_state_dir(config=None):
+    """
+    Directory for state kept across restarts, shared by BetEngine and OddsEngine
+
+    Parameters:
+    - config: BetEngine configuration dictionary, read for its state_dir key
+
+    Returns:
+    - The STATE_DIR environment variable if set, else the configured state_dir (default "data")
+    """
+    return os.getenv("STATE_DIR") or (config or {}).get("state_dir", "data")
+
+
+class ProcessedStateLog:
+    """
+    JSON-lines file of [key, epoch seconds] records
+    """
+
+    def __init__(self, path, ttl_seconds=86400, compact_after=10000):
+        """
+        Initialize the log
+
+        Parameters:
+        - path: File the keys are appended to
+        - ttl_seconds: Age after which a key is dropped on load and compaction
+        - compact_after: Number of appended lines after which the file is rewritten
+        """
+        self.__path = path
+        self.__ttl_seconds = ttl_seconds
+        self.__compact_after = compact_after
+        self.__line_count = 0
+        self.__needs_newline = False  # Set when the file ends in a line cut short by a crash
+        self.__live = {}  # key -> time added of unexpired keys, oldest first; what a compaction writes back
+        self.__loaded = False  # Whether __live holds the keys already on disk
+        self.__lock = threading.Lock()
+
+    def load(self):
+        """
+        Read the unexpired keys back from disk
+
+        Returns:
+        - List of (key, time added) pairs, oldest first. JSON lists are turned back into tuples.
+        """
+        with self.__lock:
+            try:
+                self.__read()
+            except Exception as e:
+                logger.error(f"Error loading processed state from {self.__path}: {e}")
+                return []
+            live = list(self.__live.items())
+        logger.info(f"Loaded {len(live)} processed keys from {self.__path}")
+        return live
+
+    def append(self, key, added_at=None):
+        """Append one processed key to the log"""
+        added_at = time.time() if added_at is None else added_at
+        with self.__lock:
+            self.__live.pop(key, None)
+            self.__live[key] = added_at
+            self.__expire()
+            try:
+                directory = os.path.dirname(self.__path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.__path, 'a') as f:
+                    if self.__needs_newline:
+                        f.write("\n")
+                        self.__needs_newline = False
+                    f.write(json.dumps([key, added_at]) + "\n")
+                self.__line_count += 1
+                if self.__line_count > max(self.__compact_after, 2 * len(self.__live)):
+                    self.__compact()
+            except Exception as e:
+                logger.error(f"Error appending to processed state {self.__path}: {e}")
+
+    def clear(self):
+        """Forget all keys and truncate the file"""
+        with self.__lock:
+            self.__live = {}
+            self.__line_count = 0
+            self.__loaded = True
+            if os.path.exists(self.__path):
+                open(self.__path, 'w').close()
+
+    def __read(self):
+        """Replace the in-memory keys with the unexpired keys on disk (caller holds the lock)"""
+        cutoff = time.time() - self.__ttl_seconds
+        live = {}
+        line_count = 0
+        line = ""
+        if os.path.exists(self.__path):
+            with open(self.__path, 'r') as f:
+                for line in f:
+                    line_count += 1
+                    try:
+                        key, added_at = json.loads(line)
+                    except (ValueError, TypeError):
+                        # A line cut short by a crash, skip it
+                        continue
+                    if isinstance(key, list):
+                        key = tuple(key)
+                    if added_at >= cutoff:
+                        live.pop(key, None)
+                        live[key] = added_at
+
+        self.__live = dict(sorted(live.items(), key=lambda item: item[1]))
+        self.__line_count = line_count
+        self.__needs_newline = bool(line) and not line.endswith("\n")
+        self.__loaded = True
+
+    def __expire(self):
+        """Drop keys older than the TTL from memory, oldest first (caller holds the lock)"""
+        cutoff = time.time() - self.__ttl_seconds
+        while self.__live:
+            key, added_at = next(iter(self.__live.items()))
+            if added_at >= cutoff:
+                break
+            del self.__live[key]
+
+    def __compact(self):
+        """Rewrite the file with only unexpired keys (caller holds the lock)"""
+        if not self.__loaded:
+            # Memory only holds this session's keys, rewriting from it would lose the ones on disk
+            self.__read()
+        cutoff = time.time() - self.__ttl_seconds
+        self.__live = {key: added_at for key, added_at in self.__live.items() if added_at >= cutoff}
+        tmp_path = f"{self.__path}.tmp"
+        with open(tmp_path, 'w') as f:
+            for key, added_at in self.__live.items():
+                f.write(json.dumps([key, added_at]) + "\n")
+        os.replace(tmp_path, self.__path)
+        self.__line_count = len(self.__live)
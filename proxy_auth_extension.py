@@ -0,0 +1,107 @@
+"""
+Proxy authentication inside Chrome, without a Python proxy in between
+
+Chrome is pointed at the proxy with --proxy-server and answers its
+authentication challenge through a small generated Manifest V3 extension, so
+page loads go straight from Chrome to the proxy.
+"""
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from urllib.parse import unquote, urlsplit
+
+MANIFEST = {
+    "manifest_version": 3,
+    "name": "Proxy Auth",
+    "version": "1.0",
+    "permissions": ["webRequest", "webRequestAuthProvider"],
+    "host_permissions": ["<all_urls>"],
+    "background": {"service_worker": "background.js"},
+}
+
+BACKGROUND_TEMPLATE = """const credentials = {credentials};
+
+chrome.webRequest.onAuthRequired.addListener(
+  (details) => details.isProxy ? {{ authCredentials: credentials }} : {{}},
+  {{ urls: ["<all_urls>"] }},
+  ["blocking"]
+);
+"""
+
+# Private parent directory of the extensions written by this process, see _private_directory
+_extensions_directory = None
+_extensions_directory_lock = threading.Lock()
+
+
+def split_proxy(proxy):
+    """
+    Split a proxy URL into the address Chrome connects to and its credentials
+
+    Parameters:
+    - proxy: Proxy URL in format "host:port", "user:pass@host:port" or with a scheme such as "http://"
+
+    Returns:
+    - Tuple of (server, username, password), e.g. ("http://host:port", "user", "pass");
+      username and password are None when the proxy needs no authentication
+    """
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urlsplit(proxy)
+    server = f"{parts.scheme}://{parts.hostname}"
+    if parts.port:
+        server = f"{server}:{parts.port}"
+
+    username = unquote(parts.username) if parts.username else None
+    password = unquote(parts.password) if parts.password else None
+    return server, username, password
+
+
+def _private_directory():
+    """Return this process's parent directory for extensions, readable by the current user only"""
+    global _extensions_directory
+    with _extensions_directory_lock:
+        if _extensions_directory is None:
+            # mkdtemp creates the directory with mode 0o700 under an unpredictable name
+            _extensions_directory = tempfile.mkdtemp(prefix="msport-proxy-auth-")
+            atexit.register(shutil.rmtree, _extensions_directory, True)
+        return _extensions_directory
+
+
+def build_proxy_auth_extension(username, password, directory=None):
+    """
+    Write an unpacked extension that answers proxy authentication challenges
+
+    Every driver of the same credentials loads the same extension directory. Its
+    files hold the credentials in plain text, so the directory is private to the
+    current user and the files are rewritten on every call rather than trusted.
+
+    Parameters:
+    - username: Proxy username
+    - password: Proxy password
+    - directory: Parent directory of the extension (defaults to a private temp directory of this process)
+
+    Returns:
+    - Path of the extension directory, for --load-extension
+    """
+    background = BACKGROUND_TEMPLATE.format(
+        credentials=json.dumps({"username": username, "password": password or ""})
+    )
+    digest = hashlib.sha1(background.encode()).hexdigest()[:12]
+    path = os.path.join(directory or _private_directory(), f"proxy-auth-{digest}")
+
+    files = {"manifest.json": json.dumps(MANIFEST, indent=2), "background.js": background}
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    # makedirs leaves an existing directory's mode alone, and fails here if it belongs to another user
+    os.chmod(path, 0o700)
+    for name, content in files.items():
+        file_path = os.path.join(path, name)
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+    return path
@@ -0,0 +1,144 @@
+"""
+Bet slip submission over HTTP, without a browser
+
+Posts a single bet straight to MSport's betting API with the cookies captured at
+login and the outcome found in the indexed market book. The result tells the
+caller whether the bet was placed, definitely not placed (safe to retry in the
+browser) or possibly placed (a timeout or dropped connection after the request
+was sent, which must not be retried or the bet could be placed twice).
+"""
+import logging
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError
+
+logger = logging.getLogger('msport_betting')
+
+# Placement results
+PLACED = "placed"
+REJECTED = "rejected"  # Not placed, safe to retry through the browser
+UNCERTAIN = "uncertain"  # The API may have accepted the bet, do not retry
+
+# MSport API success code, as in the balance API
+SUCCESS_CODE = 10000
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+    "Referer": "https://www.msport.com/",
+}
+
+
+def _failed_before_sending(error):
+    """
+    Tell whether a request failed before any of it reached the API
+
+    Only a connect timeout or a failure to open a new connection is certain;
+    requests also raises ConnectionError when the connection drops after the
+    body was sent (e.g. "Connection aborted"), which must count as uncertain.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if type(error) is not requests.exceptions.ConnectionError:
+        return False
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+class RestBetPlacer:
+    """
+    Places single bets through MSport's bet slip endpoint
+    """
+
+    def __init__(self, bet_host, path, timeout=10, accept_odds_change=False):
+        """
+        Initialize the placer
+
+        Parameters:
+        - bet_host: MSport website host, e.g. https://www.msport.com
+        - path: Path of the bet slip endpoint on the host
+        - timeout: Seconds to wait for the API to answer
+        - accept_odds_change: Whether the API may place the bet at changed odds
+        """
+        self.__url = f"{bet_host.rstrip('/')}/{path.lstrip('/')}"
+        self.__timeout = timeout
+        self.__accept_odds_change = accept_odds_change
+
+    def build_bet_slip(self, event_id, outcome, stake):
+        """
+        Build the bet slip of a single bet
+
+        Parameters:
+        - event_id: The MSport event ID
+        - outcome: MarketOutcome from the event's MSportMarketBook
+        - stake: Amount to stake
+
+        Returns:
+        - The JSON body of the request
+        """
+        market = outcome.market or {}
+        return {
+            "betType": "SINGLE",
+            "stake": str(stake),
+            "acceptOddsChange": self.__accept_odds_change,
+            "selections": [{
+                "eventId": event_id,
+                "marketId": market.get("id"),
+                "specifier": market.get("specifiers") or market.get("specifier") or "",
+                "outcomeId": outcome.outcome_id,
+                "odds": str(outcome.odds),
+            }],
+        }
+
+    def place(self, account, event_id, outcome, stake):
+        """
+        Submit a single bet with an account's session cookies
+
+        Parameters:
+        - account: BetAccount with the cookies of a logged-in session
+        - event_id: The MSport event ID
+        - outcome: MarketOutcome to bet on
+        - stake: Amount to stake
+
+        Returns:
+        - PLACED, REJECTED or UNCERTAIN
+        """
+        if not account.cookie_jar:
+            logger.info(f"No session cookies for account {account.username}, cannot place bet over REST")
+            return REJECTED
+
+        bet_slip = self.build_bet_slip(event_id, outcome, stake)
+        try:
+            response = account.get_http_session().post(
+                self.__url, json=bet_slip, headers=HEADERS, cookies=account.cookie_jar, timeout=self.__timeout
+            )
+        except requests.exceptions.RequestException as e:
+            if _failed_before_sending(e):
+                logger.error(f"Could not reach bet slip API for account {account.username}: {e}")
+                return REJECTED
+            # Read timeouts and dropped connections: the API may have received the bet slip
+            logger.error(f"Bet slip request failed after it was sent for account {account.username}, bet may have been placed: {e}")
+            return UNCERTAIN
+        except Exception as e:
+            logger.error(f"Error submitting bet slip for account {account.username}: {e}")
+            return UNCERTAIN
+
+        if response.status_code != 200:
+            logger.error(f"Bet slip rejected for account {account.username}: HTTP {response.status_code}")
+            return REJECTED if response.status_code < 500 else UNCERTAIN
+
+        try:
+            result = response.json()
+        except ValueError:
+            logger.error(f"Invalid bet slip response for account {account.username}: {response.text[:200]}")
+            return UNCERTAIN
+
+        if result.get("bizCode") != SUCCESS_CODE:
+            logger.warning(f"Bet slip rejected for account {account.username}: {result.get('bizCode')} {result.get('message', '')}")
+            return REJECTED
+
+        logger.info(f"Bet placed over REST for account {account.username}: {outcome.description} @ {outcome.odds}, stake {stake}")
+        return PLACED
@@ -5,16 +5,128 @@ import os
 import tempfile
 import uuid
 import json
+from selenium import webdriver as selenium_webdriver
 from seleniumwire import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+from proxy_auth_extension import build_proxy_auth_extension, split_proxy
+
+
+# Proxy backends: selenium-wire proxies every request through Python, "extension"
+# lets Chrome connect to the proxy itself and authenticates with a generated extension
+PROXY_BACKENDS = ("seleniumwire", "extension")
+
+
+def build_chrome_options(headless=False, proxy=None, proxy_backend="seleniumwire"):
+    """
+    Build the Chrome options for a driver.
+    
+    Args:
+        headless (bool): Whether to run Chrome in headless mode
+        proxy (str): Proxy URL in format "host:port" or "user:pass@host:port"
+        proxy_backend (str): "seleniumwire" or "extension", see PROXY_BACKENDS
+    
+    Returns:
+        Tuple of (Chrome options, Selenium Wire options)
+    """
+    if proxy_backend not in PROXY_BACKENDS:
+        raise ValueError(f"Unknown proxy backend: {proxy_backend}")
+    
+    # Set up Chrome options
+    options = Options()
+    # if headless:
+    options.add_argument("--headless=new")
+    
+    # Additional options for better compatibility
+    # Images, fonts and trackers are blocked per request instead, see resource_filter
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    if proxy_backend == "seleniumwire":
+        # The extension backend needs extensions for proxy authentication
+        options.add_argument("--disable-extensions")
+    options.add_argument("--disable-plugins")
+    options.add_argument("--memory-pressure-off")
+    
+    # Add user agent
+    options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36")
+    
+    # Set page load strategy
+    options.page_load_strategy = 'eager'
+    
+    # Set up Selenium Wire options for proxy authentication
+    seleniumwire_options = {}
+    
+    if proxy and proxy_backend == "extension":
+        server, username, password = split_proxy(proxy)
+        print(f"Configuring Chrome proxy: {server}")
+        options.add_argument(f"--proxy-server={server}")
+        if username:
+            extension_path = build_proxy_auth_extension(username, password)
+            options.add_argument(f"--load-extension={extension_path}")
+            # Branded Chrome 137+ ignores --load-extension unless this switch is turned back on
+            options.add_argument("--disable-features=DisableLoadExtensionCommandLineSwitch")
+    elif proxy:
+        print(f"Configuring proxy: {proxy}")
+        
+        # Parse the proxy URL to extract components
+        if proxy.startswith("http://"):
+            proxy_url = proxy
+        else:
+            proxy_url = f"http://{proxy}"
+        
+        # Configure selenium-wire options with proxy
+        seleniumwire_options = {
+            "proxy": {
+                "http": proxy_url,
+                "https": proxy_url
+            }
+        }
+        
+        print(f"Configured Selenium Wire proxy: {proxy_url}")
+    
+    return options, seleniumwire_options
+
+
+def create_driver(headless=False, proxy=None, proxy_backend="seleniumwire"):
+    """
+    Create a Chrome WebDriver that authenticates with the given proxy.
+    
+    Args:
+        headless (bool): Whether to run Chrome in headless mode
+        proxy (str): Proxy URL in format "host:port" or "user:pass@host:port"
+        proxy_backend (str): "seleniumwire" or "extension", see PROXY_BACKENDS
+    
+    Returns:
+        The Chrome WebDriver
+    """
+    options, seleniumwire_options = build_chrome_options(headless, proxy, proxy_backend)
+    
+    try:
+        if proxy_backend == "extension":
+            # Plain Selenium: page loads never pass through Python
+            driver = selenium_webdriver.Chrome(options=options)
+        else:
+            # Initialize the Chrome driver with Selenium Wire
+            driver = webdriver.Chrome(
+                # service=Service(ChromeDriverManager().install()),
+                seleniumwire_options=seleniumwire_options,
+                options=options
+            )
+        print(f"Driver successful: {driver}")
+        return driver
+    except Exception as e:
+        print(f"Error setting up ChromeDriver: {e}")
+        raise
+
 
 class WebsiteOpener:
-    """A class to handle opening websites with Selenium Wire for proxy authentication."""
+    """A class to handle opening websites through an authenticated proxy."""
 
-    def __init__(self, headless=False, proxy=None, config_file="config.json"):
+    def __init__(self, headless=False, proxy=None, config_file="config.json", proxy_backend=None):
         """
         Initialize the WebsiteOpener.
         
@@ -22,9 +134,11 @@ class WebsiteOpener:
             headless (bool): Whether to run Chrome in headless mode
             proxy (str): Proxy URL in format "host:port" or "user:pass@host:port"
             config_file (str): Path to config.json file containing proxy settings
+            proxy_backend (str): "seleniumwire" or "extension"; read from config.json if not given
         """
         self.proxy = proxy
         self.config_file = config_file
+        self.proxy_backend = proxy_backend
         self.setup_driver(headless)
     
     def get_proxy_from_config(self):
@@ -44,72 +158,25 @@ class WebsiteOpener:
             print(f"Error reading config file: {e}")
             return None
     
+    def get_proxy_backend_from_config(self):
+        """Read the proxy backend from config.json file, defaulting to Selenium Wire."""
+        try:
+            with open(self.config_file, 'r') as f:
+                return json.load(f).get('proxy_backend', 'seleniumwire')
+        except Exception as e:
+            print(f"Error reading config file: {e}")
+            return 'seleniumwire'
+    
     def setup_driver(self, headless):
-        """Set up the Chrome WebDriver with Selenium Wire for proxy authentication."""
+        """Set up the Chrome WebDriver with the configured proxy backend."""
 
         # Get proxy from config if not provided
         if not self.proxy:
             self.proxy = self.get_proxy_from_config()
+        if not self.proxy_backend:
+            self.proxy_backend = self.get_proxy_backend_from_config()
         
-        # Set up Chrome options
-        options = Options()
-        # if headless:
-        options.add_argument("--headless=new")
-        
-        # Additional options for better compatibility
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-plugins")
-        options.add_argument("--disable-images")
-        options.add_argument("--disable-javascript")  # Only if not needed
-        options.add_argument("--memory-pressure-off")
-        options.add_argument("--max_old_space_size=4096")
-        
-        # Add user agent
-        options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36")
-        
-        # Set page load strategy
-        options.page_load_strategy = 'eager'
-        
-        # Set up Selenium Wire options for proxy authentication
-        seleniumwire_options = {}
-        
-        if self.proxy:
-            print(f"Configuring proxy: {self.proxy}")
-            
-            # Parse the proxy URL to extract components
-            if self.proxy.startswith("http://"):
-                proxy_url = self.proxy
-            else:
-                proxy_url = f"http://{self.proxy}"
-            
-            # Configure selenium-wire options with proxy
-            seleniumwire_options = {
-                "proxy": {
-                    "http": proxy_url,
-                    "https": proxy_url
-                }
-            }
-            
-            print(f"Configured Selenium Wire proxy: {proxy_url}")
-        
-        # Initialize the Chrome driver with Selenium Wire
-        try:
-            self.driver = webdriver.Chrome(
-                # service=Service(ChromeDriverManager().install()),
-                seleniumwire_options=seleniumwire_options,
-                options=options
-            )
-            print(f"Driver successful: {self.driver}")
-        except Exception as e:
-            print(f"Error setting up ChromeDriver: {e}")
-            raise
+        self.driver = create_driver(headless, self.proxy, self.proxy_backend)
 
     def open_url(self, url):
         """
@@ -0,0 +1,170 @@
+"""
+Warm reuse of MSport account sessions
+
+A logged-in account keeps the cookies exported from its browser. Before a bet,
+SessionManager checks those cookies with the balance API (one HTTP call,
+skipped entirely when the account was validated a moment ago) and injects them
+into the browser through the DevTools protocol. The full UI login is only
+needed when the session has expired.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger('msport_betting')
+
+BALANCE_PATH = "/api/ng/pocket/financialAccounts/balance"
+
+BALANCE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Accept": "application/json",
+    "Referer": "https://www.msport.com/",
+}
+
+
+class SessionManager:
+    """
+    Validates account sessions over REST and restores them into browsers
+    """
+
+    def __init__(self, bet_host, validate_after=60):
+        """
+        Initialize the session manager
+
+        Parameters:
+        - bet_host: MSport website host, e.g. https://www.msport.com
+        - validate_after: Seconds a successful validation is trusted before the balance API is asked again
+        """
+        self.__bet_host = bet_host.rstrip("/")
+        self.__validate_after = validate_after
+        self.__validated_at = {}  # username -> monotonic time of the last successful validation
+        self.__lock = threading.Lock()
+
+    def fetch_balance(self, account):
+        """
+        Fetch the balance of an account with its stored cookies
+
+        Parameters:
+        - account: BetAccount with a cookie jar
+
+        Returns:
+        - Balance as float, or None if the cookies are missing or no longer accepted
+        """
+        if not account.cookie_jar:
+            logger.warning(f"No cookies available for account {account.username}, cannot fetch balance")
+            return None
+
+        cookies = account.cookie_jar
+        if isinstance(cookies, list):
+            cookies = {cookie["name"]: cookie["value"] for cookie in cookies}
+
+        try:
+            response = account.get_http_session().get(
+                f"{self.__bet_host}{BALANCE_PATH}", headers=BALANCE_HEADERS, cookies=cookies
+            )
+        except Exception as e:
+            logger.error(f"Error fetching balance for account {account.username}: {e}")
+            return None
+
+        if response.status_code != 200:
+            logger.error(f"Failed to fetch balance for account {account.username}: HTTP {response.status_code}")
+            return None
+
+        try:
+            balance_data = response.json()
+        except ValueError:
+            logger.warning(f"Invalid balance response for account {account.username}: {response.text[:200]}")
+            return None
+
+        if balance_data.get("bizCode") != 10000 or "data" not in balance_data:
+            logger.warning(f"Invalid balance response for account {account.username}: {balance_data}")
+            return None
+
+        avl_bal = balance_data["data"].get("avlBal", 0)
+        biz_code = balance_data["bizCode"]
+
+        # Calculate real balance as avlBal / bizCode
+        real_balance = avl_bal / biz_code
+        logger.info(f"Account {account.username} balance: {real_balance:.2f} (avlBal: {avl_bal}, bizCode: {biz_code})")
+        self.mark_valid(account)
+        return real_balance
+
+    def is_valid(self, account):
+        """
+        Check whether the stored session of an account is still logged in
+
+        Parameters:
+        - account: BetAccount to check
+
+        Returns:
+        - True if the session was validated recently or the balance API accepts its cookies
+        """
+        if not account.cookie_jar:
+            return False
+
+        with self.__lock:
+            validated_at = self.__validated_at.get(account.username)
+        if validated_at is not None and time.monotonic() - validated_at <= self.__validate_after:
+            return True
+
+        balance = self.fetch_balance(account)
+        if balance is None:
+            self.invalidate(account)
+            return False
+        account.balance = balance
+        return True
+
+    def mark_valid(self, account):
+        """Remember that the session of an account was just confirmed, e.g. after a UI login"""
+        with self.__lock:
+            self.__validated_at[account.username] = time.monotonic()
+
+    def invalidate(self, account):
+        """Forget the last validation of an account so the next check asks the balance API"""
+        with self.__lock:
+            self.__validated_at.pop(account.username, None)
+
+    def restore(self, driver, account):
+        """
+        Put a valid stored session into a browser without going through the login page
+
+        Parameters:
+        - driver: Chrome WebDriver to inject the cookies into
+        - account: BetAccount whose session to restore
+
+        Returns:
+        - True if the session is valid and its cookies were injected, False if a UI login is needed
+        """
+        if not account.browser_cookies or not self.is_valid(account):
+            return False
+
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setCookies", {
+                "cookies": [self.__cdp_cookie(cookie) for cookie in account.browser_cookies]
+            })
+        except Exception as e:
+            logger.warning(f"Could not inject cookies for account {account.username}: {e}")
+            return False
+
+        logger.info(f"Reusing stored session for account: {account.username}")
+        return True
+
+    def __cdp_cookie(self, cookie):
+        """Convert a Selenium cookie dictionary to a DevTools Network.CookieParam"""
+        param = {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "path": cookie.get("path", "/"),
+            "secure": cookie.get("secure", False),
+            "httpOnly": cookie.get("httpOnly", False),
+        }
+        if cookie.get("domain"):
+            param["domain"] = cookie["domain"]
+        else:
+            param["url"] = self.__bet_host
+        if cookie.get("expiry"):
+            param["expires"] = cookie["expiry"]
+        if cookie.get("sameSite"):
+            param["sameSite"] = cookie["sameSite"]
+        return param
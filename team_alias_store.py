@@ -0,0 +1,80 @@
+"""
+Learned Pinnacle -> MSport team name aliases
+
+Every time a search confirms a fixture (team words and start time both match),
+the Pinnacle and MSport spellings of both teams are recorded. Known teams can
+then be searched with their exact MSport names in a single request.
+
+A search only finds fixtures whose team names share a word with MSport's, so
+only such aliases are learned (e.g. Wolverhampton -> Wolverhampton Wanderers).
+Names with nothing in common, such as Man Utd -> Manchester United, have to be
+seeded by hand.
+"""
+import json
+import logging
+import os
+import threading
+
+from utils.normalize_team_name import normalize_team_name
+from utils.write_json_atomic import write_json_atomic
+
+logger = logging.getLogger('msport_betting')
+
+
+class TeamAliasStore:
+    """
+    Persistent mapping of normalized Pinnacle team names to MSport team names
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the store and load known aliases from disk
+
+        Parameters:
+        - path: JSON file the aliases are persisted to; it can also be edited by
+          hand to seed aliases such as {"man utd": "Manchester United"}
+        """
+        self.__path = path
+        self.__aliases = {}
+        self.__lock = threading.Lock()
+        self.__load()
+
+    def get(self, pinnacle_name):
+        """
+        Return the MSport name of a Pinnacle team, or None if unknown
+        """
+        return self.__aliases.get(normalize_team_name(pinnacle_name))
+
+    def record(self, pinnacle_name, msport_name):
+        """
+        Record a confirmed Pinnacle -> MSport team name pair
+        """
+        key = normalize_team_name(pinnacle_name)
+        if not key or not msport_name:
+            return
+
+        with self.__lock:
+            if self.__aliases.get(key) == msport_name:
+                return
+            self.__aliases[key] = msport_name
+            logger.info(f"Learned team alias: {pinnacle_name} -> {msport_name}")
+            try:
+                write_json_atomic(self.__path, self.__aliases)
+            except Exception as e:
+                logger.error(f"Error saving team aliases: {e}")
+
+    def __len__(self):
+        return len(self.__aliases)
+
+    def __load(self):
+        if not os.path.exists(self.__path):
+            return
+        try:
+            with open(self.__path, 'r') as f:
+                aliases = json.load(f)
+            # Normalize keys so hand-written entries match too
+            self.__aliases = {normalize_team_name(name): alias for name, alias in aliases.items()}
+            logger.info(f"Loaded {len(self.__aliases)} team aliases from {self.__path}")
+        except Exception as e:
+            logger.error(f"Error loading team aliases: {e}")
+            self.__aliases = {}
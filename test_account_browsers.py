@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that every account worker keeps its own browser slot and runs bets concurrently
+"""
+
+import threading
+
+from account_browsers import AccountBrowserPool
+
+
+def test_each_account_has_its_own_slot_and_thread():
+    """Calls for the same account share one slot and thread, other accounts get their own"""
+    pool = AccountBrowserPool()
+
+    def whoami():
+        return pool.current_slot(), threading.current_thread().name
+
+    try:
+        first_slot, first_thread = pool.submit("alice", whoami).result()
+        again_slot, again_thread = pool.submit("alice", whoami).result()
+        other_slot, other_thread = pool.submit("bob", whoami).result()
+
+        assert first_slot is again_slot and first_thread == again_thread
+        assert other_slot is not first_slot and other_thread != first_thread
+        assert pool.current_slot() is None  # The caller is not an account worker
+        assert sorted(pool.keys()) == ["alice", "bob"]
+    finally:
+        pool.shutdown()
+
+
+def test_accounts_run_concurrently_and_close_their_slot():
+    """A bet on several accounts runs in parallel, and shutdown closes every slot on its own worker"""
+    pool = AccountBrowserPool()
+    accounts = ["alice", "bob", "carol"]
+    barrier = threading.Barrier(len(accounts), timeout=5)
+
+    def place_bet():
+        pool.current_slot().open = True
+        barrier.wait()  # Only passes if all accounts are placing at the same time
+        return True
+
+    closed = []
+
+    def close():
+        slot = pool.current_slot()
+        slot.open = False
+        closed.append(slot)
+
+    futures = [pool.submit(account, place_bet) for account in accounts]
+    assert all(future.result() for future in futures)
+
+    pool.shutdown(close_slot=close)
+    assert len(closed) == len(accounts) and not any(slot.open for slot in closed)
+    assert pool.keys() == []
+
+
+if __name__ == "__main__":
+    test_each_account_has_its_own_slot_and_thread()
+    test_accounts_run_concurrently_and_close_their_slot()
+    print("✅ Account browser tests passed")
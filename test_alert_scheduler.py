@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Test script to verify young alerts are parked and released in due-time order
+"""
+
+from alert_scheduler import AlertScheduler
+
+
+def test_alerts_released_when_due_in_order():
+    """Only matured alerts are released, earliest due first"""
+    scheduler = AlertScheduler()
+    scheduler.schedule({"id": "late"}, 130)
+    scheduler.schedule({"id": "early"}, 110)
+    scheduler.schedule({"id": "middle"}, 120)
+
+    assert scheduler.pop_due(now=100) == []
+    assert scheduler.next_due_time() == 110
+    assert [alert["id"] for alert in scheduler.pop_due(now=125)] == ["early", "middle"]
+    assert len(scheduler) == 1
+    assert [alert["id"] for alert in scheduler.pop_due(now=130)] == ["late"]
+    assert scheduler.next_due_time() is None
+
+
+def test_repolled_alert_is_parked_once():
+    """An alert seen again by the next poll while it waits is not parked twice"""
+    scheduler = AlertScheduler()
+    assert scheduler.schedule({"id": "a1"}, 110)
+    assert not scheduler.schedule({"id": "a1"}, 115)
+    assert len(scheduler.pop_due(now=200)) == 1
+
+    # Once released it can be scheduled again
+    assert scheduler.schedule({"id": "a1"}, 300)
+
+
+if __name__ == "__main__":
+    test_alerts_released_when_due_in_order()
+    test_repolled_alert_is_parked_once()
+    print("✅ Alert scheduler tests passed")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the no-vig price calculations: batch devig, method selection, caching, the power solver and bet evaluation
+"""
+
+import numpy as np
+
+from utils.calculate_no_vig_prices import (
+    METHODS,
+    calculate_no_vig_prices,
+    calculate_no_vig_prices_batch,
+    clear_no_vig_cache,
+    get_no_vig_cache_stats,
+    solve_power_exponent,
+)
+from utils.evaluate_bet import evaluate_bet
+
+
+def test_batch_matches_single_market():
+    """Every method gives the same prices for 2-way and 3-way rows in one batch"""
+    markets = [
+        {'home': 4.11, 'away': 1.854, 'draw': 3.09},
+        {'home': 1.95, 'away': 1.87},
+        {'home': 1.4, 'away': 5.5, 'draw': 4.2},
+    ]
+    odds = np.array([[market['home'], market['away'], market.get('draw', np.nan)] for market in markets])
+
+    batch = calculate_no_vig_prices_batch(odds, methods=METHODS)
+
+    for method in METHODS:
+        for row, market in enumerate(markets):
+            single = calculate_no_vig_prices(market, methods=(method,))[method]
+            for column, outcome in enumerate(['home', 'away', 'draw']):
+                if outcome in market:
+                    assert abs(single[outcome] - batch[method][row, column]) < 1e-9
+        assert np.isnan(batch[method][1, 2])
+
+
+def test_only_requested_methods_are_computed():
+    """Callers that only read the power method only get the power method"""
+    assert list(calculate_no_vig_prices({'home': 1.9, 'away': 1.9}, methods=('power',))) == ['power']
+    assert list(calculate_no_vig_prices_batch(np.array([[1.9, 1.9]]))) == ['power']
+
+
+def test_repeated_prices_hit_the_cache():
+    """The same line priced twice is only solved once, and callers get their own copy"""
+    clear_no_vig_cache()
+    first = calculate_no_vig_prices({'home': 2.1, 'away': 1.8}, methods=('power',))
+    first['power']['home'] = 0
+    second = calculate_no_vig_prices({'away': 1.8, 'home': 2.1}, methods=('power',))
+
+    assert second['power']['home'] > 2.1
+    assert get_no_vig_cache_stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+
+def test_power_exponent_removes_the_overround():
+    """The Newton solver finds the exponent that makes the powered probabilities sum to one"""
+    for odds in ([4.11, 1.854, 3.09], [1.95, 1.87], [1.01, 21.0]):
+        probabilities = [1 / price for price in odds]
+        k = solve_power_exponent(probabilities, tolerance=1e-12)
+        assert k > 1
+        assert abs(sum(prob ** k for prob in probabilities) - 1) < 1e-12
+
+
+def test_evaluate_bet_scalar_and_array():
+    """EV and Kelly fraction agree for a single bet and the same bet in an array"""
+    fair_probability, ev, kelly_fraction = evaluate_bet(2.1, 2.0)
+    assert fair_probability == 0.5
+    assert abs(ev - 5.0) < 1e-9
+    assert abs(kelly_fraction - (1.1 * 0.5 - 0.5) / 1.1) < 1e-12
+
+    _, evs, kelly_fractions = evaluate_bet(np.array([2.1, 1.8]), np.array([2.0, 2.0]))
+    assert abs(evs[0] - ev) < 1e-9
+    assert kelly_fractions[1] == 0  # No edge, no stake
+
+    # Odds of 1.0 return the stake only: no edge instead of a division by zero
+    assert evaluate_bet(1.0, 2.0)[2] == 0
+    _, _, kelly_fractions = evaluate_bet(np.array([1.0, 0.9, 2.1]), np.array([2.0, 2.0, 2.0]))
+    assert list(kelly_fractions[:2]) == [0, 0] and abs(kelly_fractions[2] - kelly_fraction) < 1e-12
+
+
+if __name__ == "__main__":
+    test_batch_matches_single_market()
+    test_only_requested_methods_are_computed()
+    test_repeated_prices_hit_the_cache()
+    test_power_exponent_removes_the_overround()
+    test_evaluate_bet_scalar_and_array()
+    print("✅ No-vig price tests passed")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the concurrent event search stops early without a browser or the search API
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bet_engine import BetEngine
+
+
+class _SearchOnlyEngine(BetEngine):
+    """BetEngine without Chrome or config, enough to run the search helpers"""
+
+    def __init__(self, results, max_workers):
+        self._BetEngine__search_executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.results = results
+        self.searched = []
+        self.release = threading.Event()
+        self._BetEngine__fetch_search_results = self.__fake_search
+
+    def __fake_search(self, search_term):
+        self.searched.append(search_term)
+        if search_term not in self.results:
+            # Searches that return nothing useful are slow
+            self.release.wait(5)
+        return self.results.get(search_term, [])
+
+    def search(self, search_strategies, home_team, away_team, start_time=None):
+        return self._BetEngine__search_event_concurrently(search_strategies, home_team, away_team, start_time)
+
+    def __del__(self):
+        self._BetEngine__search_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _event(event_id, home, away, start_time):
+    return {"eventId": event_id, "homeTeam": home, "awayTeam": away, "startTime": start_time}
+
+
+def test_perfect_match_stops_the_search_and_cancels_queued_ones():
+    """Once a result scores a perfect name and start time match, queued searches never run"""
+    start_time = int((time.time() + 3600) * 1000)
+    engine = _SearchOnlyEngine(
+        {"arsenal chelsea": [_event("sr:match:1", "Arsenal", "Chelsea", start_time)]},
+        max_workers=1,
+    )
+
+    started = time.time()
+    matches = engine.search(["arsenal chelsea", "arsenal", "chelsea", "ars", "che"], "Arsenal", "Chelsea", start_time)
+
+    assert time.time() - started < 1
+    assert [match["event_id"] for match in matches] == ["sr:match:1"]
+
+    # The single worker may have picked up the next search before the rest were cancelled
+    engine.release.set()
+    engine._BetEngine__search_executor.shutdown(wait=True)
+    assert engine.searched[0] == "arsenal chelsea"
+    assert len(engine.searched) <= 2
+
+
+def test_without_a_perfect_match_every_search_is_scored():
+    """Partial matches do not stop the search, all strategies contribute candidates"""
+    start_time = int((time.time() + 3600) * 1000)
+    engine = _SearchOnlyEngine(
+        {
+            "arsenal": [_event("sr:match:2", "Arsenal Women", "Chelsea Women", start_time)],
+            "chelsea": [_event("sr:match:3", "Arsenal FC", "Chelsea FC", start_time + 5 * 3600 * 1000)],
+        },
+        max_workers=3,
+    )
+    engine.release.set()
+
+    matches = engine.search(["arsenal chelsea", "arsenal", "chelsea"], "Arsenal", "Chelsea", start_time)
+
+    assert sorted(engine.searched) == ["arsenal", "arsenal chelsea", "chelsea"]
+    assert [match["event_id"] for match in matches] == ["sr:match:3"]
+    assert not matches[0]["time_match"]
+
+
+if __name__ == "__main__":
+    test_perfect_match_stops_the_search_and_cancels_queued_ones()
+    test_without_a_perfect_match_every_search_is_scored()
+    print("✅ Concurrent search tests passed")
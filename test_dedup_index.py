@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the bounded dedup index evicts oldest and expired keys
+"""
+
+import time
+
+from dedup_index import DedupIndex
+
+
+def test_oldest_keys_are_evicted_first():
+    """Going over max_size drops the oldest keys, not an arbitrary subset"""
+    index = DedupIndex(max_size=3)
+    for key in ["a", "b", "c", "d"]:
+        index.add(key)
+
+    assert len(index) == 3
+    assert "a" not in index
+    assert all(key in index for key in ["b", "c", "d"])
+
+    # Re-adding a key makes it the newest again
+    index.add("b")
+    index.add("e")
+    assert "c" not in index
+    assert "b" in index
+
+
+def test_expired_keys_are_forgotten():
+    """Keys older than the TTL are no longer reported as seen"""
+    index = DedupIndex(max_size=10, ttl_seconds=60)
+    index.add(("alert", "old"), added_at=time.time() - 120)
+    index.add(("alert", "new"))
+
+    assert ("alert", "old") not in index
+    assert ("alert", "new") in index
+    assert len(index) == 1
+
+
+if __name__ == "__main__":
+    test_oldest_keys_are_evicted_first()
+    test_expired_keys_are_forgotten()
+    print("✅ Dedup index tests passed")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the warm driver pool: leasing, health checks, resets and recycling
+"""
+
+import itertools
+import time
+
+from driver_pool import DriverPool
+
+
+class _FakeDriver:
+    """Stands in for a Chrome WebDriver"""
+
+    _ids = itertools.count()
+
+    def __init__(self, proxy):
+        self.id = next(self._ids)
+        self.proxy = proxy
+        self.healthy = True
+        self.quit_called = False
+        self.commands = []
+        self.scripts = []
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("chrome not reachable")
+        self.scripts.append(script)
+        return 1
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params.get("origin")) if "origin" in params else command)
+
+    def get(self, url):
+        self.commands.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _wait_for_warm(pool, proxy, count=1):
+    deadline = time.time() + 5
+    while pool.idle_count(proxy) < count and time.time() < deadline:
+        time.sleep(0.01)
+    assert pool.idle_count(proxy) >= count
+
+
+def test_lease_uses_warm_driver_per_proxy():
+    """A warmed proxy is served without starting Chrome, and gets a new warm driver afterwards"""
+    started = []
+    pool = DriverPool(lambda proxy: started.append(proxy) or _FakeDriver(proxy),
+                      clear_origins=["https://www.msport.com/"])
+    try:
+        pool.warm(["http://proxy-a:8000", "http://proxy-b:8000", "http://proxy-a:8000"])
+        _wait_for_warm(pool, "http://proxy-a:8000")
+        _wait_for_warm(pool, "http://proxy-b:8000")
+        assert sorted(started) == ["http://proxy-a:8000", "http://proxy-b:8000"]
+
+        driver = pool.lease("http://proxy-a:8000")
+        assert driver.proxy == "http://proxy-a:8000"
+        _wait_for_warm(pool, "http://proxy-a:8000")  # Replacement warmed in the background
+
+        # A released driver is reset but not kept beyond the warm size
+        pool.release(driver)
+        assert "Network.clearBrowserCookies" in driver.commands and driver.quit_called
+        assert ("Storage.clearDataForOrigin", "https://www.msport.com") in driver.commands
+        assert any("localStorage.clear()" in script and "sessionStorage.clear()" in script
+                   for script in driver.scripts)
+        assert driver.commands[-1] == "about:blank"
+    finally:
+        pool.shutdown()
+
+
+def test_unhealthy_and_worn_out_drivers_are_replaced():
+    """Dead warm drivers are skipped on lease, drivers past max uses are recycled on release"""
+    created = []
+    pool = DriverPool(lambda proxy: created.append(_FakeDriver(proxy)) or created[-1],
+                      warm_per_proxy=1, max_uses=3, max_memory_mb=None)
+    try:
+        pool.warm([None])
+        _wait_for_warm(pool, None)
+
+        # A warm driver whose Chrome died is discarded and another one is started
+        crashed = created[0]
+        crashed.healthy = False
+        driver = pool.lease(None)
+        assert crashed.quit_called and driver is not crashed and driver.healthy
+
+        # A driver that crashed while leased is not kept
+        driver.healthy = False
+        pool.release(driver)
+        assert driver.quit_called
+
+        driver = pool.lease(None)
+        assert not pool.record_use(driver)
+        assert not pool.record_use(driver)
+        assert pool.record_use(driver)  # Third use reaches max_uses
+        pool.release(driver)
+        assert driver.quit_called
+    finally:
+        pool.shutdown()
+
+
+def test_lease_fails_after_shutdown():
+    """A shut down pool does not start Chrome for new leases"""
+    started = []
+    pool = DriverPool(lambda proxy: started.append(proxy) or _FakeDriver(proxy))
+    pool.shutdown()
+
+    try:
+        pool.lease(None)
+        assert False, "lease() should fail once the pool is shut down"
+    except RuntimeError:
+        pass
+    assert started == []
+
+
+if __name__ == "__main__":
+    test_lease_uses_warm_driver_per_proxy()
+    test_unhealthy_and_worn_out_drivers_are_replaced()
+    test_lease_fails_after_shutdown()
+    print("✅ Driver pool tests passed")
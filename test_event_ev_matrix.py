@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the whole-event EV matrix
+Checks that MSport outcomes are joined with the right Pinnacle line and priced like the per-market path
+"""
+
+import math
+
+from event_ev_matrix import evaluate_event
+from msport_market_book import MSportMarketBook, FULL_TIME, FIRST_HALF, line_key
+from pinnacle_snapshot import PinnacleSnapshotCache, index_pinnacle_lines
+from test_msport_market_book import SAMPLE_EVENT
+from utils.calculate_ev import calculate_ev
+from utils.calculate_no_vig_prices import calculate_no_vig_prices
+
+PINNACLE_PERIODS = {
+    "num_0": {
+        "money_line": {"home": 2.05, "away": 3.70, "draw": 3.50},
+        "totals": {
+            "2.5": {"points": 2.5, "over": 1.90, "under": 1.95},
+            "6.5": {"points": 6.5, "over": 2.60, "under": 1.50},
+        },
+        "spreads": {
+            "-0.5": {"hdp": -0.5, "home": 2.00, "away": 1.85},
+            "-0.75": {"hdp": -0.75, "home": 2.20, "away": 1.70},
+        },
+    },
+    "num_1": {
+        "spreads": {"0": {"hdp": 0, "home": 1.75, "away": 2.10}},
+    },
+}
+
+
+def _candidates():
+    book = MSportMarketBook(SAMPLE_EVENT)
+    return {(c.period, c.family, c.line, c.side): c for c in evaluate_event(book, index_pinnacle_lines(PINNACLE_PERIODS))}
+
+
+def test_snapshot_is_indexed_once_per_fetch():
+    """Lines are found by (period, family, quarter-goal line) from a single fetch"""
+    fetches = []
+    cache = PinnacleSnapshotCache(lambda event_id: fetches.append(event_id) or PINNACLE_PERIODS)
+
+    lines = cache.get_lines(1601234567)
+    assert lines[(FULL_TIME, "spread", line_key(-0.75))][:2] == (2.20, 1.70)
+    assert lines[(FULL_TIME, "total", line_key("6.5"))][:2] == (2.60, 1.50)
+    assert math.isnan(lines[(FIRST_HALF, "spread", 0)][2])
+    assert (FIRST_HALF, "money_line", None) not in lines
+
+    assert cache.get_lines(1601234567) is lines
+    assert cache.get_periods(1601234567) is PINNACLE_PERIODS
+    assert fetches == [1601234567]
+
+
+def test_outcomes_join_their_pinnacle_line():
+    """Totals beyond 5.5, quarter handicaps, away handicaps and DNB all find their line"""
+    candidates = _candidates()
+
+    assert (FULL_TIME, "total", 6.5, "over") in candidates
+    assert (FULL_TIME, "spread", -0.75, "home") in candidates
+    assert (FIRST_HALF, "dnb", None, "away") in candidates
+
+    # Away +0.5 on MSport is the -0.5 home line on Pinnacle
+    away = candidates[(FULL_TIME, "spread", 0.5, "away")]
+    expected = calculate_no_vig_prices({"home": 2.00, "away": 1.85}, methods=("power",))["power"]["away"]
+    assert abs(away.true_price - expected) < 1e-6
+
+
+def test_ev_matches_single_market_evaluation():
+    """Vectorized EV equals the EV of the per-market path for every candidate"""
+    home = _candidates()[(FULL_TIME, "money_line", None, "home")]
+
+    true_price = calculate_no_vig_prices({"home": 2.05, "away": 3.70, "draw": 3.50}, methods=("power",))["power"]["home"]
+    assert abs(home.true_price - true_price) < 1e-6
+    assert abs(home.ev - calculate_ev(2.10, true_price)) < 1e-4
+    assert home.kelly_fraction >= 0
+
+
+if __name__ == "__main__":
+    test_snapshot_is_indexed_once_per_fetch()
+    test_outcomes_join_their_pinnacle_line()
+    test_ev_matches_single_market_evaluation()
+    print("✅ Event EV matrix tests passed")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the persistent fixture -> MSport event resolution cache
+"""
+
+import os
+import tempfile
+import time
+
+from event_resolution_cache import EventResolutionCache
+
+
+def test_resolution_survives_restart():
+    """A stored resolution is found again by a new cache instance on the same file"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "event_resolutions.json")
+        kickoff = int((time.time() + 3600) * 1000)
+
+        cache = EventResolutionCache(path)
+        cache.put("Atlético Madrid", "Real Betis", kickoff, "sr:match:42", 24)
+
+        reloaded = EventResolutionCache(path)
+        entry = reloaded.get("atletico madrid", "Real  Betis", kickoff)
+        assert entry["event_id"] == "sr:match:42"
+        assert entry["score"] == 24
+
+
+def test_started_and_unknown_fixtures_are_not_cached():
+    """Fixtures that kicked off or have no start time never hit the cache"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = EventResolutionCache(os.path.join(tmp_dir, "event_resolutions.json"))
+        started = int((time.time() - 60) * 1000)
+
+        cache.put("Chelsea", "Arsenal", started, "sr:match:1", 22)
+        cache.put("Chelsea", "Arsenal", None, "sr:match:1", 22)
+
+        assert cache.get("Chelsea", "Arsenal", started) is None
+        assert cache.get("Chelsea", "Arsenal", None) is None
+        assert len(cache) == 0
+
+
+if __name__ == "__main__":
+    test_resolution_survives_restart()
+    test_started_and_unknown_fixtures_are_not_cached()
+    print("✅ Event resolution cache tests passed")
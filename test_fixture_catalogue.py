@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the fixture catalogue against a local stub of the fixtures endpoint
+"""
+
+import json
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+from fixture_catalogue import FixtureCatalogue
+from test_support import stub_server
+
+
+def _event(event_id, home, away, starts_in_hours=2):
+    return {
+        "eventId": event_id,
+        "homeTeam": home,
+        "awayTeam": away,
+        "startTime": int((time.time() + starts_in_hours * 3600) * 1000),
+    }
+
+
+class _FixturesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        page_num, page_size = int(query["pageNum"][0]), int(query["pageSize"][0])
+        self.server.requested_pages.append(page_num)
+
+        if self.server.fail_page == page_num:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        events = self.server.events[(page_num - 1) * page_size:page_num * page_size]
+        # Alternate between the response shapes the catalogue accepts
+        if page_num % 2:
+            data = {"events": events}
+        else:
+            data = {"tournaments": [{"events": events[:1]}, {"events": events[1:]}]}
+        response = json.dumps({"bizCode": 10000, "data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_refresh_pages_until_a_short_page():
+    """Every page is fetched until one comes back short, across both response shapes"""
+    events = [_event(f"sr:match:{i}", f"Home {i}", f"Away {i}") for i in range(5)]
+    with stub_server(_FixturesHandler, events=events, requested_pages=[], fail_page=None) as server:
+        catalogue = FixtureCatalogue(f"http://127.0.0.1:{server.server_port}", "/fixtures", page_size=2)
+        assert not catalogue.is_ready()
+
+        assert catalogue.refresh() == 5
+        assert server.requested_pages == [1, 2, 3]
+        assert catalogue.is_ready() and len(catalogue) == 5
+
+
+def test_events_outside_the_window_expire():
+    """Started and far-off fixtures are left out, and fixtures gone from the API leave the index"""
+    events = [
+        _event("sr:match:1", "Arsenal", "Chelsea"),
+        _event("sr:match:2", "Everton", "Fulham", starts_in_hours=-1),
+        _event("sr:match:3", "Leeds United", "Burnley", starts_in_hours=30),
+    ]
+    with stub_server(_FixturesHandler, events=events, requested_pages=[], fail_page=None) as server:
+        catalogue = FixtureCatalogue(f"http://127.0.0.1:{server.server_port}", "/fixtures", hours_ahead=24)
+        assert catalogue.refresh() == 1
+        assert catalogue.candidates("Everton", "Fulham") == []
+        assert catalogue.candidates("Leeds United", "Burnley") == []
+
+        server.events = [_event("sr:match:4", "Everton", "Fulham")]
+        catalogue.refresh()
+        assert catalogue.candidates("Arsenal", "Chelsea") == []
+        assert [event["eventId"] for event in catalogue.candidates("Everton", "Fulham")] == ["sr:match:4"]
+
+
+def test_failed_page_keeps_previous_catalogue():
+    """A refresh that fails halfway does not publish a partial catalogue"""
+    events = [_event(f"sr:match:{i}", f"Home {i}", f"Away {i}") for i in range(4)]
+    with stub_server(_FixturesHandler, events=events, requested_pages=[], fail_page=None) as server:
+        catalogue = FixtureCatalogue(f"http://127.0.0.1:{server.server_port}", "/fixtures", page_size=2)
+        assert catalogue.refresh() == 4
+
+        server.fail_page = 2
+        server.events = events + [_event("sr:match:9", "Brentford", "Wolves")]
+        assert catalogue.refresh() == 4
+        assert catalogue.candidates("Brentford", "Wolves") == []
+        assert len(catalogue) == 4
+
+
+def test_candidates_need_a_token_from_both_teams():
+    """Lookup matches on normalized name tokens of the home and the away team"""
+    events = [
+        _event("sr:match:1", "Manchester United", "Leeds United"),
+        _event("sr:match:2", "Manchester City", "Arsenal"),
+    ]
+    with stub_server(_FixturesHandler, events=events, requested_pages=[], fail_page=None) as server:
+        catalogue = FixtureCatalogue(f"http://127.0.0.1:{server.server_port}", "/fixtures")
+        catalogue.refresh()
+
+        assert [event["eventId"] for event in catalogue.candidates("Manchester Utd", "Leeds")] == ["sr:match:1"]
+        assert [event["eventId"] for event in catalogue.candidates("Man City", "Arsenal FC")] == ["sr:match:2"]
+        assert catalogue.candidates("Arsenal", "Chelsea") == []
+
+
+if __name__ == "__main__":
+    test_refresh_pages_until_a_short_page()
+    test_events_outside_the_window_expire()
+    test_failed_page_keeps_previous_catalogue()
+    test_candidates_need_a_token_from_both_teams()
+    print("✅ Fixture catalogue tests passed")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the pooled HTTP sessions reuse connections and time out
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import requests
+
+from http_client import PooledSession
+from test_support import stub_server
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/slow":
+            self.server.release.wait(5)
+        body = str(self.client_address[1]).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_connection_is_reused():
+    """Two calls to the same host go over the same keep-alive connection"""
+    with stub_server(_Handler, release=threading.Event()) as server:
+        session = PooledSession()
+        url = f"http://127.0.0.1:{server.server_port}/"
+        first_port = session.get(url).text
+        second_port = session.get(url).text
+        assert first_port == second_port
+
+
+def test_default_timeout_applies():
+    """A hung response raises instead of blocking the caller"""
+    with stub_server(_Handler, release=threading.Event()) as server:
+        session = PooledSession(timeout=(1, 0.2))
+        try:
+            session.get(f"http://127.0.0.1:{server.server_port}/slow")
+            assert False, "request should have timed out"
+        except requests.exceptions.Timeout:
+            pass
+        finally:
+            server.release.set()
+
+
+if __name__ == "__main__":
+    test_connection_is_reused()
+    test_default_timeout_applies()
+    print("✅ HTTP client tests passed")
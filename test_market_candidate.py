@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test script to verify market candidates are immutable and carry what bet placement needs
+"""
+
+from market_candidate import MarketCandidate
+from msport_market_book import FULL_TIME, FIRST_HALF
+
+
+def test_candidate_is_immutable():
+    """Fields cannot be changed, added or removed after creation"""
+    candidate = MarketCandidate(FULL_TIME, "total", 2.5, "over", 1.95, 1.90, 2.6, 50)
+
+    for action in (lambda: setattr(candidate, "stake", 0),
+                   lambda: setattr(candidate, "note", "x"),
+                   lambda: delattr(candidate, "ev")):
+        try:
+            action()
+        except AttributeError:
+            continue
+        raise AssertionError("candidate was modified")
+    assert candidate.stake == 50
+    assert not hasattr(candidate, "__dict__")
+
+
+def test_placement_fields():
+    """DNB candidates are placed as DNB with a level line"""
+    dnb = MarketCandidate(FIRST_HALF, "dnb", None, "away", 2.2, 2.1, 4.8, 20)
+    assert (dnb.market_type, dnb.points, dnb.is_first_half) == ("DNB", 0.0, True)
+
+    spread = MarketCandidate(FULL_TIME, "spread", -0.75, "home", 2.3, 2.2, 4.5, 20)
+    assert (spread.market_type, spread.points, spread.is_first_half) == ("spread", -0.75, False)
+    assert spread == MarketCandidate(FULL_TIME, "spread", -0.75, "home", 2.3, 2.2, 4.5, 20)
+
+
+if __name__ == "__main__":
+    test_candidate_is_immutable()
+    test_placement_fields()
+    print("✅ Market candidate tests passed")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the indexed MSport market book
+Checks that outcomes parsed from a match/detail response are found by (period, family, line, outcome id)
+"""
+
+from msport_market_book import MSportMarketBook, FULL_TIME, FIRST_HALF
+
+SAMPLE_EVENT = {
+    "eventId": "sr:match:1",
+    "homeTeam": "Chelsea",
+    "awayTeam": "Arsenal",
+    "markets": [
+        {"description": "1x2", "outcomes": [
+            {"id": "1", "odds": "2.10", "description": "Home"},
+            {"id": "2", "odds": "3.40", "description": "Draw"},
+            {"id": "3", "odds": "3.60", "description": "Away"},
+        ]},
+        {"description": "Over/Under", "outcomes": [
+            {"id": "12", "odds": "1.95", "description": "Over 2.5"},
+            {"id": "13", "odds": "1.85", "description": "Under 2.5"},
+            {"id": "12", "odds": "3.10", "description": "Over 6.5"},
+        ]},
+        {"description": "Asian Handicap", "outcomes": [
+            {"id": "1714", "odds": "1.90", "description": "Home (-0.5)"},
+            {"id": "1715", "odds": "1.92", "description": "Away (+0.5)"},
+            {"id": "1714", "odds": "2.05", "description": "Home (-0.75)"},
+        ]},
+        {"description": "1st Half - DNB", "outcomes": [
+            {"id": "4", "odds": "1.70", "description": "Home"},
+            {"id": "5", "odds": "2.20", "description": "Away"},
+        ]},
+        {"description": "Correct Score", "outcomes": [
+            {"id": "1", "odds": "9.00", "description": "1:0"},
+        ]},
+    ],
+}
+
+
+def test_lookups():
+    """Every supported family is indexed with its parsed line"""
+    book = MSportMarketBook(SAMPLE_EVENT)
+
+    home = book.find(FULL_TIME, "money_line", None, "1")
+    assert home.odds == 2.10 and home.side == "home"
+
+    over = book.find(FULL_TIME, "total", 2.5, "12")
+    assert over.odds == 1.95 and over.line == 2.5
+
+    assert book.find(FULL_TIME, "total", 6.5, "12").odds == 3.10
+    assert book.find(FULL_TIME, "spread", 0.5, "1715").line == 0.5
+    assert book.find(FULL_TIME, "spread", -0.75, "1714").odds == 2.05
+    assert book.find(FIRST_HALF, "dnb", None, "5").odds == 2.20
+
+
+def test_missing_and_unsupported_markets():
+    """Unknown markets are not indexed and missing lines return None"""
+    book = MSportMarketBook(SAMPLE_EVENT)
+
+    assert book.find(FULL_TIME, "total", 3.5, "12") is None
+    assert book.find(FIRST_HALF, "money_line", None, "1") is None
+    # The correct score outcome with id "1" must not shadow the 1x2 home outcome
+    assert book.find(FULL_TIME, "money_line", None, "1").odds == 2.10
+    assert len(list(book.outcomes(family="spread"))) == 3
+
+
+if __name__ == "__main__":
+    test_lookups()
+    test_missing_and_unsupported_markets()
+    print("✅ Market book tests passed")
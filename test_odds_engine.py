@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test script to verify OddsEngine alert processing without calling Pinnacle
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+
+def _engine(bet_engine, **env):
+    """Create an OddsEngine with a throwaway state directory and the given settings"""
+    settings = {
+        "PINNACLE_HOST": "http://pinnacle.invalid",
+        "PINNACLE_USER_ID": "test-user",
+        "STATE_DIR": tempfile.mkdtemp(),
+        **env,
+    }
+    saved = {name: os.environ.get(name) for name in settings}
+    os.environ.update(settings)
+    try:
+        from odds_engine import OddsEngine
+        return OddsEngine(bet_engine=bet_engine)
+    finally:
+        # Settings are read once in __init__, do not leak them into other tests
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _alert(alert_id, event_id, line_type="total"):
+    return {
+        "id": alert_id,
+        "eventId": event_id,
+        "home": f"Home {event_id}",
+        "away": f"Away {event_id}",
+        "lineType": line_type,
+        "outcome": "over",
+        "points": 2.5,
+        "starts": int(time.time() * 1000) + 3600 * 1000,
+        "timestamp": int(time.time() * 1000) - 120 * 1000,
+    }
+
+
+class _SlowBetEngine:
+    """Bet engine that takes a while per alert and records how many alerts run at once"""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.notified = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def notify(self, shaped_data):
+        with self.lock:
+            self.notified.append(shaped_data["eventId"])
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return False
+
+
+def test_async_pipeline_bounds_concurrency_and_dedups():
+    """A batch runs at most ALERT_PIPELINE_CONCURRENCY alerts at once and every alert only once"""
+    bet_engine = _SlowBetEngine()
+    engine = _engine(bet_engine, ALERT_PIPELINE_MODE="async", ALERT_PIPELINE_CONCURRENCY="3")
+
+    alerts = [_alert(f"a{i}", i) for i in range(6)]
+    # The same alert twice in one batch, and a second alert for an event + line type already in the batch
+    alerts += [_alert("a0", 0), _alert("b1", 1)]
+
+    started = time.time()
+    engine._OddsEngine__process_alerts(alerts)
+    elapsed = time.time() - started
+
+    assert sorted(bet_engine.notified) == list(range(6))
+    assert bet_engine.max_running == 3
+    assert elapsed < 6 * bet_engine.delay
+
+    # Alerts of a later batch that were already processed are skipped as well
+    engine._OddsEngine__process_alerts([_alert("a2", 2)])
+    assert len(bet_engine.notified) == 6
+
+
+def test_async_pipeline_works_after_restart():
+    """Stopping and starting monitoring again leaves the async pipeline usable"""
+    bet_engine = _SlowBetEngine(delay=0)
+    engine = _engine(bet_engine, ALERT_PIPELINE_MODE="async", ALERT_PIPELINE_CONCURRENCY="2")
+
+    for restart in range(2):
+        engine.start_monitoring(interval=3600)
+        engine.stop()
+        engine._OddsEngine__process_alerts([_alert(f"r{restart}", 100 + restart)])
+
+    assert bet_engine.notified == [100, 101]
+
+
+def test_stream_cursors_only_move_forward_per_stream():
+    """Each alert advances the cursor of its own stream, and never backwards"""
+    engine = _engine(_SlowBetEngine(), ALERT_INGESTION_MODE="stream")
+    cursors = engine._OddsEngine__cursors
+    start = dict(cursors)
+
+    engine._OddsEngine__advance_cursors([
+        {"type": "oddsDrop", "id": "9000000000000-3"},
+        {"type": "oddsDrop", "id": "9000000000000-1"},
+        {"type": "limitChange", "id": "9000000000005-0"},
+        {"type": "oddsDrop", "id": "8000000000000-7"},
+    ])
+    assert cursors["drop"] == (9000000000000, 3)
+    assert cursors["limitChange"] == (9000000000005, 0)
+    assert cursors["openingLine"] == start["openingLine"]
+
+    # The sequence number orders alerts of the same millisecond
+    engine._OddsEngine__advance_cursors([{"type": "oddsDrop", "id": "9000000000000-12"}])
+    assert cursors["drop"] == (9000000000000, 12)
+
+
+def test_unknown_types_and_malformed_ids():
+    """Unknown alert types leave every cursor alone, malformed IDs fall back to the timestamp"""
+    engine = _engine(_SlowBetEngine(), ALERT_INGESTION_MODE="stream")
+    cursors = engine._OddsEngine__cursors
+    start = dict(cursors)
+
+    engine._OddsEngine__advance_cursors([
+        {"type": "lineMove", "id": "9999999999999-0"},
+        {"id": "9999999999999-0"},
+        {"type": "oddsDrop", "id": "not-a-cursor", "timestamp": "garbage"},
+    ])
+    assert cursors == start
+
+    engine._OddsEngine__advance_cursors([{"type": "openingLine", "id": "abc", "timestamp": 9000000000000}])
+    assert cursors["openingLine"] == (9000000000000, 0)
+
+    parse_cursor = engine._OddsEngine__parse_cursor
+    assert parse_cursor("1700000000000-2") == (1700000000000, 2)
+    assert parse_cursor("1700000000000") is None
+    assert parse_cursor(None) is None
+    assert parse_cursor("1700000000000-x") is None
+
+
+def test_stream_poll_interval_backs_off_when_idle():
+    """Stream mode polls fast while alerts flow and doubles up to the interval when idle"""
+    engine = _engine(_SlowBetEngine(), ALERT_INGESTION_MODE="stream", ALERT_STREAM_MIN_INTERVAL="2")
+    poll_interval = engine._OddsEngine__poll_interval
+
+    assert poll_interval(60, 0) == 2
+    assert [poll_interval(60, 0) for _ in range(6)] == [4, 8, 16, 32, 60, 60]
+    assert poll_interval(60, 5) == 2
+
+    window_engine = _engine(_SlowBetEngine(), ALERT_INGESTION_MODE="window")
+    assert window_engine._OddsEngine__poll_interval(60, 0) == 60
+
+
+if __name__ == "__main__":
+    test_async_pipeline_bounds_concurrency_and_dedups()
+    test_async_pipeline_works_after_restart()
+    test_stream_cursors_only_move_forward_per_stream()
+    test_unknown_types_and_malformed_ids()
+    test_stream_poll_interval_backs_off_when_idle()
+    print("✅ Odds engine tests passed")
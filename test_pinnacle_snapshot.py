@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the Pinnacle snapshot cache: TTL, one fetch per event at a time and invalidation
+"""
+
+import threading
+import time
+
+from pinnacle_snapshot import PinnacleSnapshotCache
+
+PERIODS = {"num_0": {"money_line": {"home": 2.1, "draw": 3.4, "away": 3.5}}}
+
+
+class _CountingFetch:
+    """Fetch function that counts calls per event and can be slowed down"""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, event_id):
+        with self.lock:
+            self.calls.append(event_id)
+        time.sleep(self.delay)
+        return PERIODS
+
+
+def test_snapshot_is_reused_until_ttl():
+    """A snapshot answers every lookup within the TTL and is fetched again after it"""
+    fetch = _CountingFetch()
+    cache = PinnacleSnapshotCache(fetch, ttl_seconds=0.2)
+
+    assert cache.get_periods(1) == PERIODS
+    assert cache.get_periods(1) == PERIODS
+    assert cache.get_lines(1)
+    assert fetch.calls == [1]
+
+    time.sleep(0.25)
+    cache.get_periods(1)
+    assert fetch.calls == [1, 1]
+
+
+def test_concurrent_lookups_fetch_once_per_event():
+    """Threads asking for the same event wait for a single fetch, other events are not blocked"""
+    fetch = _CountingFetch(delay=0.2)
+    cache = PinnacleSnapshotCache(fetch, ttl_seconds=10)
+
+    threads = [threading.Thread(target=cache.get_periods, args=(event_id,)) for event_id in [1] * 5 + [2] * 5]
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(fetch.calls) == [1, 2]
+    assert time.time() - started < 0.35
+
+
+def test_invalidate_and_expiry_drop_fetch_locks():
+    """Invalidated or expired events are fetched again and leave no lock behind"""
+    fetch = _CountingFetch()
+    cache = PinnacleSnapshotCache(fetch, ttl_seconds=0.1, max_events=2)
+    event_locks = cache._PinnacleSnapshotCache__event_locks
+
+    cache.get_periods(1)
+    cache.get_periods(2)
+    cache.invalidate(1)
+    assert 1 not in event_locks
+    cache.get_periods(1)
+    assert fetch.calls == [1, 2, 1]
+
+    cache.invalidate()
+    assert event_locks == {}
+
+    # Expired events are purged with their locks once the cache is full
+    for event_id in range(10, 13):
+        cache.get_periods(event_id)
+    time.sleep(0.15)
+    cache.get_periods(20)
+    assert set(event_locks) == {20}
+
+
+if __name__ == "__main__":
+    test_snapshot_is_reused_until_ttl()
+    test_concurrent_lookups_fetch_once_per_event()
+    test_invalidate_and_expiry_drop_fetch_locks()
+    print("✅ Pinnacle snapshot cache tests passed")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script to verify processed alerts and games survive a restart
+"""
+
+import os
+import tempfile
+import time
+
+from dedup_index import DedupIndex
+from processed_state_log import ProcessedStateLog, resolve_state_dir
+
+
+def test_dedup_index_survives_restart():
+    """Keys added before a restart are known to a new index on the same log"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "processed_alerts.jsonl")
+
+        index = DedupIndex(store=ProcessedStateLog(path))
+        index.add(("alert", "1747423479000-0"))
+        index.add(("event_line", "1601234567_money_line"))
+
+        restarted = DedupIndex(store=ProcessedStateLog(path))
+        assert ("alert", "1747423479000-0") in restarted
+        assert ("event_line", "1601234567_money_line") in restarted
+        assert ("alert", "other") not in restarted
+
+
+def test_expired_and_truncated_lines_are_skipped():
+    """Old keys and a line cut short by a crash are ignored on load"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "processed_games.jsonl")
+        log = ProcessedStateLog(path, ttl_seconds=60)
+        log.append("Chelsea_Arsenal_1", added_at=time.time() - 120)
+        log.append("Lyon_Nice_2")
+        with open(path, "a") as f:
+            f.write('["Roma_Lazio')
+
+        reloaded = ProcessedStateLog(path, ttl_seconds=60)
+        assert [key for key, _ in reloaded.load()] == ["Lyon_Nice_2"]
+
+        # The next append starts on a fresh line
+        reloaded.append("Porto_Braga_3")
+        assert [key for key, _ in ProcessedStateLog(path, ttl_seconds=60).load()] == ["Lyon_Nice_2", "Porto_Braga_3"]
+
+
+def test_log_is_compacted():
+    """Appending the same keys over and over does not grow the file without bound"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "processed_games.jsonl")
+        log = ProcessedStateLog(path, compact_after=10)
+        for i in range(50):
+            log.append(f"game_{i % 3}")
+
+        with open(path) as f:
+            assert len(f.readlines()) <= 10
+        assert sorted(key for key, _ in ProcessedStateLog(path).load()) == ["game_0", "game_1", "game_2"]
+
+
+def test_expired_keys_leave_memory():
+    """Keys older than the TTL are dropped from memory as new ones arrive"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log = ProcessedStateLog(os.path.join(tmp_dir, "processed_games.jsonl"), ttl_seconds=60)
+        log.load()
+        for i in range(100):
+            log.append(f"old_{i}", added_at=time.time() - 120 + i * 0.1)
+        log.append("new")
+
+        assert list(log._ProcessedStateLog__live) == ["new"]
+        assert [key for key, _ in log.load()] == ["new"]
+
+
+def test_compaction_before_load_keeps_keys_on_disk():
+    """A log compacted without being loaded first does not wipe the keys of earlier runs"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "processed_alerts.jsonl")
+        earlier_run = ProcessedStateLog(path)
+        for i in range(5):
+            earlier_run.append(f"alert_{i}")
+
+        # Repeating a key makes the file outgrow its live keys and triggers a compaction
+        log = ProcessedStateLog(path, compact_after=3)
+        for _ in range(10):
+            log.append("alert_5")
+
+        with open(path) as f:
+            assert len(f.readlines()) < 15
+        keys = sorted(key for key, _ in ProcessedStateLog(path).load())
+        assert keys == [f"alert_{i}" for i in range(6)]
+
+
+def test_processed_games_expire_in_memory_and_on_disk_alike():
+    """An index on a log forgets a key in memory when the log would drop it on restart"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "processed_games.jsonl")
+        games = DedupIndex(ttl_seconds=60, store=ProcessedStateLog(path, ttl_seconds=60))
+        games.add("Chelsea_Arsenal_1", added_at=time.time() - 120)
+        games.add("Lyon_Nice_2")
+
+        assert "Chelsea_Arsenal_1" not in games
+        restarted = DedupIndex(ttl_seconds=60, store=ProcessedStateLog(path, ttl_seconds=60))
+        assert "Chelsea_Arsenal_1" not in restarted and "Lyon_Nice_2" in restarted
+
+        restarted.clear()
+        assert "Lyon_Nice_2" not in DedupIndex(store=ProcessedStateLog(path))
+
+
+def test_state_dir_comes_from_config_unless_overridden():
+    """STATE_DIR overrides the configured state_dir, which defaults to data"""
+    saved = os.environ.pop("STATE_DIR", None)
+    try:
+        assert resolve_state_dir({}) == "data"
+        assert resolve_state_dir({"state_dir": "/var/lib/betalert"}) == "/var/lib/betalert"
+        os.environ["STATE_DIR"] = "/state"
+        assert resolve_state_dir({"state_dir": "/var/lib/betalert"}) == "/state"
+    finally:
+        os.environ.pop("STATE_DIR", None)
+        if saved is not None:
+            os.environ["STATE_DIR"] = saved
+
+
+if __name__ == "__main__":
+    test_dedup_index_survives_restart()
+    test_expired_and_truncated_lines_are_skipped()
+    test_log_is_compacted()
+    test_expired_keys_leave_memory()
+    test_compaction_before_load_keeps_keys_on_disk()
+    test_processed_games_expire_in_memory_and_on_disk_alike()
+    test_state_dir_comes_from_config_unless_overridden()
+    print("✅ Processed state log tests passed")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script to verify request blocking through DevTools and the page load timing summary
+"""
+
+from resource_filter import DEFAULT_BLOCKED_URLS, apply_resource_filter, page_load_timing
+
+
+class _RecordingDriver:
+    """Stands in for a Chrome driver and records the DevTools commands it receives"""
+
+    def __init__(self, fail=False, timing=None):
+        self.commands = []
+        self.fail = fail
+        self.timing = timing
+
+    def execute_cdp_cmd(self, command, params):
+        if self.fail:
+            raise RuntimeError("DevTools not available")
+        self.commands.append((command, params))
+        return {}
+
+    def execute_script(self, script):
+        return self.timing
+
+
+def test_blocklist_is_sent_to_chrome():
+    """Default and configured URL patterns are applied with Network.setBlockedURLs"""
+    driver = _RecordingDriver()
+    assert apply_resource_filter(driver)
+    assert driver.commands[-1] == ("Network.setBlockedURLs", {"urls": DEFAULT_BLOCKED_URLS})
+
+    assert apply_resource_filter(driver, ["*.png", "*tracker.example*"])
+    assert driver.commands[-1][1]["urls"] == ["*.png", "*tracker.example*"]
+
+    assert not apply_resource_filter(_RecordingDriver(fail=True))
+
+
+def test_page_load_timing():
+    """Browser timing is summarised with the transferred size in KB"""
+    driver = _RecordingDriver(timing={"domContentLoaded": 812.5, "load": 1490.0, "resources": 42, "transferSize": 204800})
+    assert page_load_timing(driver) == {
+        "dom_content_loaded_ms": 812.5, "load_ms": 1490.0, "resources": 42, "transfer_kb": 200.0
+    }
+    assert page_load_timing(_RecordingDriver()) is None
+
+
+if __name__ == "__main__":
+    test_blocklist_is_sent_to_chrome()
+    test_page_load_timing()
+    print("✅ Resource filter tests passed")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script to verify REST bet slip submission against a local stub of the betting API
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+
+from bet_engine import BetAccount
+from msport_market_book import MSportMarketBook, FULL_TIME
+from rest_bet_placer import RestBetPlacer, PLACED, REJECTED, UNCERTAIN
+from test_msport_market_book import SAMPLE_EVENT
+from test_support import logged_in_account, stub_server
+
+
+class _BetSlipHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.received.append((self.path, self.headers.get("Cookie", ""), body))
+
+        if self.path == "/slow":
+            self.server.release.wait(5)
+        if self.path == "/drop":
+            # The bet slip was received, then the connection dies before any answer
+            self.close_connection = True
+            return
+        if body["selections"][0]["odds"] == "1.85":
+            payload = {"bizCode": 4200, "message": "Odds changed"}
+        else:
+            payload = {"bizCode": 10000, "data": {"orderId": "A1"}}
+        response = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_bet_slip_is_submitted_with_session_cookies():
+    """The outcome from the market book and the stake are posted with the account's cookies"""
+    with stub_server(_BetSlipHandler, received=[], release=threading.Event()) as server:
+        placer = RestBetPlacer(f"http://127.0.0.1:{server.server_port}", "/orders/place")
+        over = MSportMarketBook(SAMPLE_EVENT).find(FULL_TIME, "total", 2.5, "12")
+
+        assert placer.place(logged_in_account({"sessionId": "abc"}), "sr:match:1", over, 50) == PLACED
+
+        path, cookie, body = server.received[0]
+        assert path == "/orders/place" and "sessionId=abc" in cookie
+        assert body["stake"] == "50"
+        assert body["selections"][0] == {
+            "eventId": "sr:match:1", "marketId": None, "specifier": "", "outcomeId": "12", "odds": "1.95"
+        }
+
+
+def test_rejected_and_uncertain_results():
+    """An API rejection can be retried in the browser, a timeout after sending cannot"""
+    with stub_server(_BetSlipHandler, received=[], release=threading.Event()) as server:
+        host = f"http://127.0.0.1:{server.server_port}"
+        book = MSportMarketBook(SAMPLE_EVENT)
+        under = book.find(FULL_TIME, "total", 2.5, "13")
+
+        assert RestBetPlacer(host, "/orders/place").place(logged_in_account({"sessionId": "abc"}), "sr:match:1", under, 50) == REJECTED
+        assert RestBetPlacer(host, "/orders/place").place(BetAccount("0800", "x"), "sr:match:1", under, 50) == REJECTED
+
+        over = book.find(FULL_TIME, "total", 2.5, "12")
+        assert RestBetPlacer(host, "/slow", timeout=0.3).place(logged_in_account({"sessionId": "abc"}), "sr:match:1", over, 50) == UNCERTAIN
+        server.release.set()
+
+        assert RestBetPlacer("http://127.0.0.1:1", "/orders/place").place(logged_in_account({"sessionId": "abc"}), "sr:match:1", over, 50) == REJECTED
+
+
+def test_dropped_connection_after_sending_is_uncertain():
+    """A connection closed after the bet slip was read may hide a placed bet, so it is never rejected"""
+    with stub_server(_BetSlipHandler, received=[], release=threading.Event()) as server:
+        over = MSportMarketBook(SAMPLE_EVENT).find(FULL_TIME, "total", 2.5, "12")
+        placer = RestBetPlacer(f"http://127.0.0.1:{server.server_port}", "/drop")
+
+        assert placer.place(logged_in_account({"sessionId": "abc"}), "sr:match:1", over, 50) == UNCERTAIN
+        assert len(server.received) == 1
+
+
+if __name__ == "__main__":
+    test_bet_slip_is_submitted_with_session_cookies()
+    test_rejected_and_uncertain_results()
+    test_dropped_connection_after_sending_is_uncertain()
+    print("✅ REST bet placer tests passed")
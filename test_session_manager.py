@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script to verify stored account sessions are validated over REST and restored without a UI login
+"""
+
+import json
+from http.server import BaseHTTPRequestHandler
+
+from bet_engine import BetAccount
+from session_manager import SessionManager
+from test_support import logged_in_account, stub_server
+
+
+class _BalanceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests += 1
+        if "sessionId=good" in self.headers.get("Cookie", ""):
+            payload = {"bizCode": 10000, "data": {"avlBal": 25000000}}
+        else:
+            payload = {"bizCode": 19000, "message": "Please log in"}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _RecordingDriver:
+    """Stands in for a Chrome driver and records the DevTools commands it receives"""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+        return {}
+
+
+def _session_cookies(session_id):
+    return [{"name": "sessionId", "value": session_id, "domain": "127.0.0.1", "path": "/"}]
+
+
+def test_valid_session_is_restored_without_login():
+    """Cookies accepted by the balance API are injected into the browser and validation is reused"""
+    with stub_server(_BalanceHandler, requests=0) as server:
+        sessions = SessionManager(f"http://127.0.0.1:{server.server_port}", validate_after=60)
+        account = logged_in_account(_session_cookies("good"))
+        driver = _RecordingDriver()
+
+        assert sessions.restore(driver, account)
+        assert account.balance == 2500
+        injected = dict(driver.commands)["Network.setCookies"]["cookies"]
+        assert injected[0]["name"] == "sessionId" and injected[0]["value"] == "good"
+
+        # Validated a moment ago, so the next bet does not ask the API again
+        assert sessions.restore(_RecordingDriver(), account)
+        assert server.requests == 1
+
+
+def test_expired_session_needs_login():
+    """Cookies rejected by the balance API are not injected"""
+    with stub_server(_BalanceHandler, requests=0) as server:
+        sessions = SessionManager(f"http://127.0.0.1:{server.server_port}")
+        driver = _RecordingDriver()
+
+        assert not sessions.restore(driver, logged_in_account(_session_cookies("expired")))
+        assert driver.commands == []
+        assert not sessions.restore(driver, BetAccount("08000000000", "secret"))  # Never logged in
+
+
+def test_session_marked_valid_after_login_skips_the_api():
+    """A session confirmed by a UI login is restored without a balance request"""
+    with stub_server(_BalanceHandler, requests=0) as server:
+        sessions = SessionManager(f"http://127.0.0.1:{server.server_port}", validate_after=60)
+        account = logged_in_account(_session_cookies("good"))
+        sessions.mark_valid(account)
+
+        assert sessions.restore(_RecordingDriver(), account)
+        assert server.requests == 0
+
+        # Once invalidated, the next restore asks the API again
+        sessions.invalidate(account)
+        assert sessions.restore(_RecordingDriver(), account)
+        assert server.requests == 1
+
+
+if __name__ == "__main__":
+    test_valid_session_is_restored_without_login()
+    test_expired_session_needs_login()
+    test_session_marked_valid_after_login_skips_the_api()
+    print("✅ Session manager tests passed")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the tests that talk to a local stub of an MSport endpoint
+"""
+
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+
+from bet_engine import BetAccount
+
+
+@contextmanager
+def stub_server(handler_class, **attributes):
+    """
+    Serve a request handler on a free local port for the duration of a with block
+
+    Parameters:
+    - handler_class: BaseHTTPRequestHandler subclass answering the requests
+    - attributes: Attributes set on the server, shared with the handler through self.server
+
+    Yields:
+    - The running server, its port is server.server_port
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    for name, value in attributes.items():
+        setattr(server, name, value)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def logged_in_account(cookie_jar):
+    """Create a test account holding the given session cookies"""
+    account = BetAccount("08012345678", "secret")
+    account.set_cookie_jar(cookie_jar)
+    return account
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script to verify learned Pinnacle -> MSport team aliases
+"""
+
+import json
+import os
+import tempfile
+
+from team_alias_store import TeamAliasStore
+
+
+def test_learned_alias_is_looked_up_by_normalized_name():
+    """A recorded pair is found again whatever the case or accents of the Pinnacle name"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = TeamAliasStore(os.path.join(tmp_dir, "team_aliases.json"))
+        assert store.get("Atlético Madrid") is None
+
+        store.record("Atlético Madrid", "Atletico de Madrid")
+        assert store.get("atletico madrid") == "Atletico de Madrid"
+        assert store.get("Real Betis") is None
+
+        # Empty names are never learned
+        store.record("", "Arsenal")
+        store.record("Arsenal", None)
+        assert len(store) == 1
+
+
+def test_aliases_survive_restart():
+    """Recorded aliases are written to disk and loaded by a new store"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "team_aliases.json")
+        store = TeamAliasStore(path)
+        store.record("Wolverhampton", "Wolverhampton Wanderers")
+        store.record("Wolverhampton", "Wolves")
+
+        reloaded = TeamAliasStore(path)
+        assert reloaded.get("Wolverhampton") == "Wolves"
+        assert len(reloaded) == 1
+
+
+def test_hand_seeded_aliases_and_unreadable_file():
+    """Hand-written keys are normalized on load, a corrupt file starts an empty store"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "team_aliases.json")
+        with open(path, "w") as f:
+            json.dump({"Man  Utd": "Manchester United"}, f)
+        assert TeamAliasStore(path).get("man utd") == "Manchester United"
+
+        with open(path, "w") as f:
+            f.write("{not json")
+        assert len(TeamAliasStore(path)) == 0
+
+
+if __name__ == "__main__":
+    test_learned_alias_is_looked_up_by_normalized_name()
+    test_aliases_survive_restart()
+    test_hand_seeded_aliases_and_unreadable_file()
+    print("✅ Team alias store tests passed")
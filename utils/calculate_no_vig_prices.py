@@ -1,48 +1,115 @@
-from typing import Dict, List, TypeVar, Union, Optional
+from typing import Dict, Iterable, List, TypeVar, Union, Optional
 import math
-import json
-from functools import lru_cache
+import threading
+from collections import OrderedDict
+
+import numpy as np
 
 Number = Union[float, int]
 T = TypeVar('T', bound=Dict[str, Optional[Number]])
 
-# Cache for storing calculated no-vig prices
-@lru_cache(maxsize=1000)
-def _get_cached_result(cache_key: str):
-    """Internal cache function using lru_cache decorator."""
-    return None
+METHODS = ('power', 'shin', 'additive', 'multiplicative')
+
+# Convergence tolerance of the Newton solvers, shared by the single-market and
+# batch paths so both give the same prices
+TOLERANCE = 1e-10
+
+# Bounded LRU cache of calculated no-vig prices, keyed on (sorted prices, methods)
+_CACHE_MAX_SIZE = 1000
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {'hits': 0, 'misses': 0}
+
+def _get_cached_result(cache_key: tuple) -> Optional[Dict[str, Dict[str, Optional[Number]]]]:
+    """Return a copy of the cached result for a key, or None on a miss."""
+    with _cache_lock:
+        cached_result = _cache.get(cache_key)
+        if cached_result is None:
+            _cache_stats['misses'] += 1
+            return None
+        _cache.move_to_end(cache_key)
+        _cache_stats['hits'] += 1
+    return {method: dict(prices) for method, prices in cached_result.items()}
+
+def _store_cached_result(cache_key: tuple, result: Dict[str, Dict[str, Optional[Number]]]) -> None:
+    """Store a result, evicting the least recently used entry when full."""
+    with _cache_lock:
+        _cache[cache_key] = {method: dict(prices) for method, prices in result.items()}
+        _cache.move_to_end(cache_key)
+        if len(_cache) > _CACHE_MAX_SIZE:
+            _cache.popitem(last=False)
+
+def get_no_vig_cache_stats() -> Dict[str, int]:
+    """
+    Return hit/miss counters and the size of the no-vig price cache.
+    
+    Returns:
+        Dictionary with 'hits', 'misses' and 'size'
+    """
+    with _cache_lock:
+        return {'hits': _cache_stats['hits'], 'misses': _cache_stats['misses'], 'size': len(_cache)}
+
+def clear_no_vig_cache() -> None:
+    """Empty the no-vig price cache and reset its counters."""
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats['hits'] = 0
+        _cache_stats['misses'] = 0
 
 def _convert_probability_to_decimal_odds(probability: float) -> float:
     """Convert a probability to decimal odds."""
     return 1 / probability
 
-def _adjust_power(probabilities: List[float], tolerance: float = 1e-4, max_iterations: int = 100) -> List[float]:
+def solve_power_exponent(probabilities: List[float], tolerance: float = TOLERANCE,
+                         max_iterations: int = 100) -> float:
     """
-    Power method for devigging probabilities.
+    Solve sum(p ** k) = 1 for the power method exponent k.
+    
+    Uses Newton-Raphson with the analytic derivative sum(log(p) * p ** k). The
+    function is convex and decreasing in k, and starting from k = 1 (an
+    overround above zero) keeps the iterations left of the root, so they
+    converge monotonically.
     
     Args:
-        probabilities: List of probabilities
-        tolerance: Convergence tolerance
+        probabilities: List of implied probabilities
+        tolerance: Convergence tolerance on the overround
         max_iterations: Maximum number of iterations
         
     Returns:
-        List of adjusted probabilities
+        The exponent k
     """
-    k = 1
-    adjusted_probabilities = [math.pow(prob, k) for prob in probabilities]
+    log_probabilities = [math.log(prob) for prob in probabilities]
+    k = 1.0
 
     # Newton-Raphson iterations
     for _ in range(max_iterations):
-        overround = sum(adjusted_probabilities) - 1
-        denominator = sum(math.log(prob) * math.pow(prob, k) for prob in probabilities)
+        powered = [math.exp(k * log_prob) for log_prob in log_probabilities]
+        overround = sum(powered) - 1
+        denominator = sum(log_prob * value for log_prob, value in zip(log_probabilities, powered))
+        if denominator == 0:
+            break
         k -= overround / denominator
-        adjusted_probabilities = [math.pow(prob, k) for prob in probabilities]
         if abs(overround) < tolerance:
             break
 
-    return adjusted_probabilities
+    return k
+
+def _adjust_power(probabilities: List[float], tolerance: float = TOLERANCE, max_iterations: int = 100) -> List[float]:
+    """
+    Power method for devigging probabilities.
+    
+    Args:
+        probabilities: List of probabilities
+        tolerance: Convergence tolerance
+        max_iterations: Maximum number of iterations
+        
+    Returns:
+        List of adjusted probabilities
+    """
+    k = solve_power_exponent(probabilities, tolerance=tolerance, max_iterations=max_iterations)
+    return [math.pow(prob, k) for prob in probabilities]
 
-def _adjust_shin(probabilities: List[float], tolerance: float = 1e-4, max_iterations: int = 100) -> List[float]:
+def _adjust_shin(probabilities: List[float], tolerance: float = TOLERANCE, max_iterations: int = 100) -> List[float]:
     """
     Shin method for devigging probabilities.
     
@@ -107,13 +174,14 @@ def _adjust_multiplicative(probabilities: List[float]) -> List[float]:
     booksum = sum(probabilities)
     return [prob / booksum for prob in probabilities]
 
-def calculate_no_vig_prices(decimal_prices: Dict[str, Optional[Number]]) -> Dict[str, Dict[str, Optional[Number]]]:
+def calculate_no_vig_prices(decimal_prices: Dict[str, Optional[Number]], methods: Iterable[str] = METHODS) -> Dict[str, Dict[str, Optional[Number]]]:
     """
     Calculate no-vig prices using multiple methods.
     
     Args:
         decimal_prices: Dictionary of decimal odds for each outcome
             Example: {'home': 1.8, 'draw': 3.5, 'away': 4.5}
+        methods: Devig methods to compute, a subset of METHODS (all by default)
             
     Returns:
         Dictionary containing no-vig prices calculated using different methods
@@ -129,19 +197,16 @@ def calculate_no_vig_prices(decimal_prices: Dict[str, Optional[Number]]) -> Dict
         >>> print(prices['multiplicative']['home'])
         1.82
     """
+    methods = tuple(methods)
+    
     # Check if all values are None/undefined
     if all(price is None for price in decimal_prices.values()):
-        return {
-            'power': decimal_prices,
-            'additive': decimal_prices,
-            'multiplicative': decimal_prices,
-            'shin': decimal_prices
-        }
+        return {method: decimal_prices for method in methods}
 
     # Generate cache key
-    cache_key = json.dumps(decimal_prices, sort_keys=True)
+    cache_key = (tuple(sorted(decimal_prices.items())), methods)
     cached_result = _get_cached_result(cache_key)
-    if cached_result:
+    if cached_result is not None:
         return cached_result
 
     # Convert decimal prices to probabilities and keep track of keys
@@ -153,29 +218,127 @@ def calculate_no_vig_prices(decimal_prices: Dict[str, Optional[Number]]) -> Dict
     # Extract probabilities for calculation
     probabilities = [prob for _, prob in probabilities_with_keys]
     
-    # Calculate adjusted probabilities using each method
-    power_probs = _adjust_power(probabilities)
-    shin_probs = _adjust_shin(probabilities)
-    additive_probs = _adjust_additive(probabilities)
-    multiplicative_probs = _adjust_multiplicative(probabilities)
-    
-    # Initialize result dictionaries
-    result = {
-        'power': dict(decimal_prices),
-        'shin': dict(decimal_prices),
-        'additive': dict(decimal_prices),
-        'multiplicative': dict(decimal_prices)
+    # Calculate adjusted probabilities using only the requested methods
+    adjusters = {
+        'power': _adjust_power,
+        'shin': _adjust_shin,
+        'additive': _adjust_additive,
+        'multiplicative': _adjust_multiplicative
     }
+    result = {}
+    for method in methods:
+        adjusted_probs = adjusters[method](probabilities)
+        
+        # Convert probabilities back to decimal odds and assign to respective keys
+        result[method] = dict(decimal_prices)
+        for i, (key, _) in enumerate(probabilities_with_keys):
+            result[method][key] = _convert_probability_to_decimal_odds(adjusted_probs[i])
+    
+    _store_cached_result(cache_key, result)
+    return result
+
+def calculate_no_vig_prices_batch(decimal_odds: np.ndarray, methods: Iterable[str] = ('power',),
+                                  tolerance: float = TOLERANCE, max_iterations: int = 100) -> Dict[str, np.ndarray]:
+    """
+    Calculate no-vig prices for many markets at once.
     
-    # Convert probabilities back to decimal odds and assign to respective keys
-    for i, (key, _) in enumerate(probabilities_with_keys):
-        result['power'][key] = _convert_probability_to_decimal_odds(power_probs[i])
-        result['shin'][key] = _convert_probability_to_decimal_odds(shin_probs[i])
-        result['additive'][key] = _convert_probability_to_decimal_odds(additive_probs[i])
-        result['multiplicative'][key] = _convert_probability_to_decimal_odds(multiplicative_probs[i])
+    Each row is one market. Markets with fewer outcomes (e.g. totals next to 1x2)
+    are padded with NaN, which is kept as NaN in the output.
     
+    Args:
+        decimal_odds: 2-D array of decimal odds, shape (markets, outcomes)
+        methods: Devig methods to compute, a subset of METHODS (power only by default)
+        tolerance: Convergence tolerance of the Newton iterations
+        max_iterations: Maximum number of Newton iterations
+        
+    Returns:
+        Dictionary of method -> 2-D array of no-vig decimal odds with the input's shape
+        
+    Example:
+        >>> odds = np.array([[4.11, 1.854, 3.09], [1.95, 1.95, np.nan]])
+        >>> calculate_no_vig_prices_batch(odds)['power'][1]
+        array([2., 2., nan])
+    """
+    odds = np.atleast_2d(np.asarray(decimal_odds, dtype=float))
+    valid = np.isfinite(odds) & (odds > 0)
+    probabilities = np.where(valid, 1 / np.where(valid, odds, 1), np.nan)
+    
+    batch_adjusters = {
+        'power': _adjust_power_batch,
+        'shin': _adjust_shin_batch,
+        'additive': _adjust_additive_batch,
+        'multiplicative': _adjust_multiplicative_batch
+    }
+    result = {}
+    # Empty rows and padding produce NaN on purpose, they are masked out below
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for method in methods:
+            if method in ('power', 'shin'):
+                adjusted = batch_adjusters[method](probabilities, tolerance, max_iterations)
+            else:
+                adjusted = batch_adjusters[method](probabilities)
+            result[method] = np.where(valid, 1 / adjusted, np.nan)
     return result
 
+def _adjust_power_batch(probabilities: np.ndarray, tolerance: float, max_iterations: int) -> np.ndarray:
+    """Power method for rows of NaN-padded probabilities, one exponent per row."""
+    log_probabilities = np.log(probabilities)
+    has_outcomes = np.any(np.isfinite(probabilities), axis=1, keepdims=True)
+    k = np.ones((probabilities.shape[0], 1))
+    for _ in range(max_iterations):
+        powered = np.exp(k * log_probabilities)
+        # Rows without any price have nothing to solve
+        overround = np.where(has_outcomes, np.nansum(powered, axis=1, keepdims=True) - 1, 0)
+        if np.all(np.abs(overround) < tolerance):
+            break
+        derivative = np.nansum(log_probabilities * powered, axis=1, keepdims=True)
+        k -= np.where(has_outcomes, overround / np.where(has_outcomes, derivative, 1), 0)
+    return np.exp(k * log_probabilities)
+
+def _adjust_shin_batch(probabilities: np.ndarray, tolerance: float, max_iterations: int) -> np.ndarray:
+    """Shin method for rows of NaN-padded probabilities."""
+    overround = np.nansum(probabilities, axis=1, keepdims=True)
+    n = np.sum(np.isfinite(probabilities), axis=1, keepdims=True)
+    a = probabilities ** 2 / overround
+    
+    # Two-outcome rows have a closed form, the rest use Newton-Raphson on z
+    z = np.zeros_like(overround)
+    two_way = (n == 2)[:, 0]
+    if np.any(two_way):
+        pair = probabilities[two_way]
+        pair_overround = overround[two_way]
+        # NaN-padded two-way rows keep their two outcomes in any column
+        first_prob = np.nanmax(pair, axis=1, keepdims=True)
+        second_prob = np.nanmin(pair, axis=1, keepdims=True)
+        diff_squared = (first_prob - second_prob) ** 2
+        z[two_way] = ((pair_overround - 1) * (diff_squared - pair_overround)) / (pair_overround * (diff_squared - 1))
+    
+    many_way = ~two_way
+    if np.any(many_way):
+        rows_a = a[many_way]
+        b = 1 / (n[many_way] - 2)
+        rows_z = np.zeros((rows_a.shape[0], 1))
+        for _ in range(max_iterations):
+            c = np.sqrt(rows_z ** 2 + 4 * (1 - rows_z) * rows_a)
+            cond = rows_z - b * (np.nansum(c, axis=1, keepdims=True) - 2)
+            denominator = 1 - b * np.nansum((rows_z - 2 * rows_a) / c, axis=1, keepdims=True)
+            rows_z -= cond / denominator
+            if np.all(np.abs(cond) < tolerance):
+                break
+        z[many_way] = rows_z
+    
+    return (np.sqrt(z ** 2 + 4 * (1 - z) * a) - z) / (2 * (1 - z))
+
+def _adjust_additive_batch(probabilities: np.ndarray) -> np.ndarray:
+    """Additive method for rows of NaN-padded probabilities."""
+    n = np.sum(np.isfinite(probabilities), axis=1, keepdims=True)
+    overround = np.nansum(probabilities, axis=1, keepdims=True) - 1
+    return probabilities - overround / n
+
+def _adjust_multiplicative_batch(probabilities: np.ndarray) -> np.ndarray:
+    """Multiplicative method for rows of NaN-padded probabilities."""
+    return probabilities / np.nansum(probabilities, axis=1, keepdims=True)
+
 # Example usage:
 if __name__ == "__main__":
     # Example with 3-way market (home/draw/away)
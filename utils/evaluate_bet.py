@@ -0,0 +1,40 @@
+from typing import Tuple, Union
+
+import numpy as np
+
+from utils.calculate_ev import calculate_ev
+
+Number = Union[float, np.ndarray]
+
+def evaluate_bet(odds: Number, no_vig_price: Number) -> Tuple[Number, Number, Number]:
+    """
+    Evaluate a bet from a single devigged price.
+
+    Works element-wise on NumPy arrays as well as on plain floats, so a whole
+    event can be evaluated in one call.
+
+    Args:
+        odds: The decimal odds offered by the bookmaker
+        no_vig_price: The fair decimal odds without the vig/juice
+
+    Returns:
+        Tuple of (fair_probability, ev_percentage, kelly_fraction). The Kelly
+        fraction is the share of bankroll a full Kelly bet stakes, 0 when the
+        bet has no edge or the odds are 1.0 or less.
+
+    Example:
+        >>> evaluate_bet(2.1, 2.0)
+        (0.5, 5.000000000000004, 0.04545454545454549)
+    """
+    fair_probability = 1 / no_vig_price
+    ev = calculate_ev(odds, no_vig_price)
+    net_odds = np.asarray(odds, dtype=float) - 1
+    # Odds of 1.0 or less pay nothing back: no edge, and no division by zero
+    payout = net_odds > 0
+    safe_net_odds = np.where(payout, net_odds, 1.0)
+    kelly_fraction = np.where(
+        payout, np.maximum(net_odds * fair_probability - (1 - fair_probability), 0) / safe_net_odds, 0.0
+    )
+    if np.ndim(kelly_fraction) == 0:
+        kelly_fraction = float(kelly_fraction)
+    return fair_probability, ev, kelly_fraction
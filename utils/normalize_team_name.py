@@ -0,0 +1,26 @@
+import re
+import unicodedata
+
+_NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_team_name(name: str) -> str:
+    """
+    Normalize a team name so the same team is spelled the same way across feeds.
+
+    Lowercases, strips accents and replaces punctuation with single spaces.
+
+    Args:
+        name (str): Team name as given by Pinnacle or MSport
+
+    Returns:
+        str: Normalized team name
+
+    Example:
+        >>> normalize_team_name("Atlético  Madrid")
+        'atletico madrid'
+    """
+    if not name:
+        return ""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALPHANUMERIC.sub(" ", ascii_name.lower()).strip()
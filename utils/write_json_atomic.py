@@ -0,0 +1,22 @@
+import json
+import os
+
+
+def write_json_atomic(path: str, data) -> None:
+    """
+    Write JSON to a file atomically.
+
+    The data is written to a temporary file that then replaces the target, so a
+    crash never leaves a truncated file behind.
+
+    Args:
+        path (str): Destination file; missing parent directories are created
+        data: JSON-serializable data
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)